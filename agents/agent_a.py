@@ -3,60 +3,34 @@ Agent A implementation - focuses on code review and analysis.
 """
 
 import logging
-from typing import List
+import re
+from typing import List, Optional
 
-from agents.base_agent import BaseAgent
+from agents.base_agent import HUMAN_MENTION_RE, BaseAgent
 from core.message import Message, Role, Signal
 from core.database import Database
 
 
 logger = logging.getLogger(__name__)
 
-
-class AgentA(BaseAgent):
-    """
-    Agent A - Code Review and Analysis Specialist
-    
-    Focuses on:
-    - Code review and quality analysis
-    - Identifying potential issues
-    - Suggesting improvements
-    - Best practices
-    """
-    
-    def __init__(self, db: Database, config: dict = None):
-        super().__init__(Role.AGENT_A, db, config)
-        self.persona = "code reviewer and analyzer"
-    
-    def generate_response(self, previous_message: Message) -> str:
-        """
-        Generate a thoughtful code review response.
-        
-        Agent A takes a critical but constructive approach to code review.
-        """
-        # Get conversation context
-        context = self.get_conversation_context(previous_message.session_id)
-        
-        # Analyze the previous message
-        content = previous_message.content.lower()
-        
-        # Response strategy based on message content
-        if previous_message.role == Role.HUMAN:
-            # If human started or intervened
-            return self._respond_to_human(previous_message)
-        elif previous_message.role == Role.AGENT_B:
-            # Responding to Agent B
-            return self._respond_to_agent_b(previous_message, context)
-        else:
-            # Default response
-            
-            # Try to use RAG if available
-            rag_context = ""
-            if self.rag_chain:
-                rag_context = self.query_rag(previous_message.content)
-                
-            if rag_context:
-                return f"""Based on my analysis of the codebase:
+# Keywords used for routing (matched against lowercased text). They are word
+# prefixes so inflections such as "discussing" or "reviewed" still count.
+_TOPIC_RE = re.compile(r"\b(?:discuss|review|analyz|consider)")
+_WRAP_UP_RE = re.compile(r"\b(?:conclusion|summary)")
+
+# Single-pass intent classifier for Agent B's messages; categories are listed
+# in the priority order used when several of them match. Verb keywords take
+# any suffix so "agreed", "agrees" or "correctly" still count.
+_INTENT_PRIORITY = ("agree", "disagree")
+_INTENT_RE = re.compile(
+    r"\b(?:"
+    r"(?P<agree>agree\w*|correct\w*|yes|exactly)"
+    r"|(?P<disagree>but|however|alternative\w*|disagree\w*)"
+    r")\b"
+)
+
+# Canned responses; *_TEMPLATE constants are filled in with str.format()
+_RAG_RESPONSE_TEMPLATE = """Based on my analysis of the codebase:
                 
 {rag_context}
 
@@ -65,16 +39,8 @@ From a code review perspective, I have verified this against the actual implemen
 2. **Context**: This aligns with the project structure.
 
 Agent B, do you see any alternative interpretations or creative uses for this?"""
-            
-            return self._generate_default_response(previous_message)
-    
-    def _respond_to_human(self, message: Message) -> str:
-        """Respond to human moderator input."""
-        content = message.content
-        
-        # Check if it's a topic introduction
-        if any(word in content.lower() for word in ["discuss", "review", "analyze", "consider"]):
-            return f"""Thank you for the topic. As Agent A, I'll approach this from a code review and quality perspective.
+
+_TOPIC_RESPONSE = """Thank you for the topic. As Agent A, I'll approach this from a code review and quality perspective.
 
 Let me begin by analyzing the key aspects:
 
@@ -84,21 +50,14 @@ Let me begin by analyzing the key aspects:
 4. **Performance**: Considering efficiency and scalability
 
 What are your initial thoughts, Agent B?"""
-        
-        # Human is redirecting the conversation
-        return f"""Understood. Let me refocus on: {content}
+
+_REFOCUS_RESPONSE_TEMPLATE = """Understood. Let me refocus on: {content}
 
 From a code review standpoint, I think we should consider the technical implications and potential risks.
 
 Agent B, what's your perspective on this?"""
-    
-    def _respond_to_agent_b(self, message: Message, context: str) -> str:
-        """Respond to Agent B's message."""
-        content = message.content.lower()
-        
-        # Check for agreement
-        if any(word in content for word in ["agree", "correct", "yes", "exactly"]):
-            return """I appreciate the alignment. Let me build on that point.
+
+_AGREE_RESPONSE = """I appreciate the alignment. Let me build on that point.
 
 However, I'd like to raise some critical considerations:
 
@@ -107,10 +66,8 @@ However, I'd like to raise some critical considerations:
 3. **Testing Strategy**: How do we validate this approach?
 
 These aspects are crucial for production-ready code. Thoughts?"""
-        
-        # Check for disagreement or alternative
-        elif any(word in content for word in ["but", "however", "alternative", "disagree"]):
-            return """That's a fair counterpoint. Let me consider your perspective.
+
+_DISAGREE_RESPONSE = """That's a fair counterpoint. Let me consider your perspective.
 
 While I see the merit in your approach, I want to ensure we're not overlooking:
 
@@ -119,10 +76,8 @@ While I see the merit in your approach, I want to ensure we're not overlooking:
 - **Team impact**: How does this affect other developers?
 
 Perhaps we can find a middle ground?"""
-        
-        # Default analytical response
-        else:
-            return """Interesting perspective. Let me analyze this systematically:
+
+_ANALYTICAL_RESPONSE = """Interesting perspective. Let me analyze this systematically:
 
 **Strengths I see:**
 - Clear separation of concerns
@@ -135,10 +90,8 @@ Perhaps we can find a middle ground?"""
 - Think about error scenarios
 
 What's your take on addressing these concerns?"""
-    
-    def _generate_default_response(self, message: Message) -> str:
-        """Generate a default analytical response."""
-        return """From a code review perspective, let's examine this carefully.
+
+_DEFAULT_RESPONSE = """From a code review perspective, let's examine this carefully.
 
 **Key Questions:**
 1. Is the code maintainable and readable?
@@ -147,6 +100,101 @@ What's your take on addressing these concerns?"""
 4. Is the performance acceptable?
 
 I'd like to hear thoughts on these aspects before we proceed further."""
+
+
+class AgentA(BaseAgent):
+    """
+    Agent A - Code Review and Analysis Specialist
+    
+    Focuses on:
+    - Code review and quality analysis
+    - Identifying potential issues
+    - Suggesting improvements
+    - Best practices
+    """
+
+    __slots__ = ("persona",)
+    
+    def __init__(self, db: Database, config: dict = None):
+        super().__init__(Role.AGENT_A, db, config)
+        self.persona = "code reviewer and analyzer"
+    
+    def generate_response(
+        self,
+        previous_message: Message,
+        conversation_history: Optional[List[Message]] = None
+    ) -> str:
+        """
+        Generate a thoughtful code review response.
+        
+        Agent A takes a critical but constructive approach to code review.
+        """
+        # Get conversation context
+        context = self.get_conversation_context(
+            previous_message.session_id,
+            messages=conversation_history
+        )
+        
+        # Analyze the previous message (lowercased once, shared by the helpers)
+        content_lower = previous_message.content_lower
+        
+        # Response strategy based on message content
+        if previous_message.role is Role.HUMAN:
+            # If human started or intervened
+            return self._respond_to_human(previous_message, content_lower)
+        elif previous_message.role is Role.AGENT_B:
+            # Responding to Agent B
+            return self._respond_to_agent_b(previous_message, context, content_lower)
+        else:
+            # Default response
+            
+            # Try to use RAG if available
+            rag_context = ""
+            if self.rag_chain:
+                rag_context = self.query_rag(previous_message.content)
+                
+            if rag_context:
+                return _RAG_RESPONSE_TEMPLATE.format(rag_context=rag_context)
+            
+            return self._generate_default_response(previous_message)
+    
+    def _rag_prefetch_query(self, previous_message: Message) -> Optional[str]:
+        """Only the default branch of generate_response consults RAG."""
+        if previous_message.role in (Role.HUMAN, Role.AGENT_B):
+            return None
+        return previous_message.content
+    
+    def _respond_to_human(self, message: Message, content_lower: str) -> str:
+        """Respond to human moderator input."""
+        content = message.content
+        
+        # Check if it's a topic introduction
+        if _TOPIC_RE.search(content_lower):
+            return _TOPIC_RESPONSE
+        
+        # Human is redirecting the conversation
+        return _REFOCUS_RESPONSE_TEMPLATE.format(content=content)
+    
+    def _respond_to_agent_b(self, message: Message, context: str, content_lower: str) -> str:
+        """Respond to Agent B's message."""
+        intents = {match.lastgroup for match in _INTENT_RE.finditer(content_lower)}
+        intent = next((name for name in _INTENT_PRIORITY if name in intents), None)
+        
+        # Check for agreement
+        if intent == "agree":
+            return _AGREE_RESPONSE
+        
+        # Check for disagreement or alternative
+        elif intent == "disagree":
+            return _DISAGREE_RESPONSE
+        
+        # Default analytical response
+        else:
+            return _ANALYTICAL_RESPONSE
+    
+    def _generate_default_response(self, message: Message) -> str:
+        """Generate a default analytical response."""
+        return _DEFAULT_RESPONSE
     
     def decide_signal(self, response_content: str, conversation_history: List[Message]) -> Signal:
         """
@@ -158,15 +206,16 @@ I'd like to hear thoughts on these aspects before we proceed further."""
         - Human intervention is needed
         """
         turn_count = len(conversation_history)
+        content_lower = response_content.lower()
         
         # If conversation is getting long, suggest wrapping up
         if turn_count > 20:
             logger.info("Agent A: Long conversation, considering handover")
-            if "conclusion" in response_content.lower() or "summary" in response_content.lower():
+            if _WRAP_UP_RE.search(content_lower):
                 return Signal.HANDOVER
         
         # If asking for human input explicitly
-        if "human" in response_content.lower() or "moderator" in response_content.lower():
+        if HUMAN_MENTION_RE.search(content_lower):
             return Signal.HANDOVER
         
         # Default: continue the conversation
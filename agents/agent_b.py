@@ -3,56 +3,35 @@ Agent B implementation - focuses on creative solutions and alternatives.
 """
 
 import logging
-from typing import List
+import re
+from typing import List, Optional
 
-from agents.base_agent import BaseAgent
+from agents.base_agent import HUMAN_MENTION_RE, BaseAgent
 from core.message import Message, Role, Signal
 from core.database import Database
 
 
 logger = logging.getLogger(__name__)
 
-
-class AgentB(BaseAgent):
-    """
-    Agent B - Creative Problem Solver and Brainstormer
-    
-    Focuses on:
-    - Alternative approaches
-    - Creative solutions
-    - Innovation and new ideas
-    - User experience perspective
-    """
-    
-    def __init__(self, db: Database, config: dict = None):
-        super().__init__(Role.AGENT_B, db, config)
-        self.persona = "creative problem solver and brainstormer"
-    
-    def generate_response(self, previous_message: Message) -> str:
-        """
-        Generate a creative, solution-oriented response.
-        
-        Agent B takes an innovative approach to problem-solving.
-        """
-        # Get conversation context
-        context = self.get_conversation_context(previous_message.session_id)
-        
-        # Analyze the previous message
-        content = previous_message.content.lower()
-        
-        # Response strategy based on message source
-        if previous_message.role == Role.HUMAN:
-            return self._respond_to_human(previous_message)
-        elif previous_message.role == Role.AGENT_A:
-            return self._respond_to_agent_a(previous_message, context)
-        else:
-            # Try to use RAG if available
-            rag_context = ""
-            if self.rag_chain:
-                rag_context = self.query_rag(previous_message.content)
-                
-            if rag_context:
-                return f"""I've looked at the codebase context:
+# Keywords used for routing (matched against lowercased text). Redirect words
+# are word prefixes so inflections such as "changes" or "focusing" still count.
+_REDIRECT_RE = re.compile(r"\b(?:focus|instead|shift|change)")
+# Proposals to stop (conclude, concluding, conclusion, final thoughts, in summary)
+_STOP_RE = re.compile(r"\b(?:conclu(?:de|ding|sion)|final\s+thought|in\s+summary)")
+
+# Single-pass intent classifier for Agent A's messages; categories are listed
+# in the priority order used when several of them match. Keywords other than
+# "but" are prefix matches so forms such as "risks", "carefully", "questions"
+# or "thinking" still count.
+_INTENT_PRIORITY = ("concern", "critical", "question")
+_INTENT_RE = re.compile(
+    r"(?P<concern>\b(?:concern|issue|problem|risk|edge case))"
+    r"|(?P<critical>\b(?:but\b|however|critical|careful))"
+    r"|(?P<question>\?|\b(?:question|consider|think|thoughts))"
+)
+
+# Canned responses; *_TEMPLATE constants are filled in with str.format()
+_RAG_RESPONSE_TEMPLATE = """I've looked at the codebase context:
                 
 {rag_context}
 
@@ -65,15 +44,7 @@ This is interesting! Let's think about this creatively:
 
 Agent A, does this align with your technical understanding?"""
 
-            return self._generate_default_response(previous_message)
-    
-    def _respond_to_human(self, message: Message) -> str:
-        """Respond to human moderator input."""
-        content = message.content
-        
-        # Check if it's a redirection
-        if any(word in content.lower() for word in ["focus", "instead", "shift", "change"]):
-            return f"""Great point! Let me shift perspective.
+_REDIRECT_RESPONSE_TEMPLATE = """Great point! Let me shift perspective.
 
 {content}
 
@@ -85,9 +56,8 @@ This opens up some interesting possibilities:
 3. Future-proofing - how do we stay flexible?
 
 I'm excited to explore these angles. Agent A, what's your analytical take?"""
-        
-        # Default response to human
-        return f"""Thank you for the input! Let me approach this creatively.
+
+_HUMAN_INPUT_RESPONSE = """Thank you for the input! Let me approach this creatively.
 
 Instead of focusing solely on technical constraints, let's consider:
 
@@ -96,14 +66,8 @@ Instead of focusing solely on technical constraints, let's consider:
 - **Simplicity**: What's the most elegant solution?
 
 Agent A, I'd love your critical perspective on these ideas."""
-    
-    def _respond_to_agent_a(self, message: Message, context: str) -> str:
-        """Respond to Agent A's message."""
-        content = message.content.lower()
-        
-        # If Agent A raised concerns
-        if any(word in content for word in ["concern", "issue", "problem", "risk", "edge case"]):
-            return """Those are valid technical concerns. Let me propose some creative solutions:
+
+_CONCERN_RESPONSE = """Those are valid technical concerns. Let me propose some creative solutions:
 
 **Alternative Approaches:**
 
@@ -120,10 +84,8 @@ Agent A, I'd love your critical perspective on these ideas."""
    - Can we prototype quickly and iterate?
 
 I believe if we combine your analytical rigor with creative flexibility, we'll find an elegant solution."""
-        
-        # If Agent A is being critical
-        elif any(word in content for word in ["but", "however", "critical", "careful"]):
-            return """I hear your caution, and it's valuable. But let me offer a counterbalance:
+
+_CRITICAL_RESPONSE = """I hear your caution, and it's valuable. But let me offer a counterbalance:
 
 **Why Innovation Matters:**
 - Sometimes perfect is the enemy of good
@@ -136,10 +98,8 @@ I believe if we combine your analytical rigor with creative flexibility, we'll f
 - Measure and iterate based on real data
 
 What if we took a hybrid approach that respects both perspectives?"""
-        
-        # If Agent A is asking questions
-        elif "?" in content or any(word in content for word in ["question", "consider", "think", "thoughts"]):
-            return """Great questions! Let me think through this creatively:
+
+_QUESTION_RESPONSE = """Great questions! Let me think through this creatively:
 
 **Fresh Perspectives:**
 
@@ -151,10 +111,8 @@ Here are some unconventional ideas:
 - Approach 3: [Hybrid of traditional and modern]
 
 Each has trade-offs, but they open new possibilities. Which resonates with your analytical assessment?"""
-        
-        # Default response to Agent A
-        else:
-            return """I appreciate your systematic analysis. Let me add a creative dimension:
+
+_ANALYTICAL_RESPONSE = """I appreciate your systematic analysis. Let me add a creative dimension:
 
 **Thinking Differently:**
 
@@ -166,10 +124,8 @@ While your technical points are solid, let's also consider:
 Sometimes the "good enough" solution that ships is better than the perfect solution that doesn't.
 
 Thoughts on finding that balance?"""
-    
-    def _generate_default_response(self, message: Message) -> str:
-        """Generate a default creative response."""
-        return """Let me brainstorm some ideas here:
+
+_DEFAULT_RESPONSE = """Let me brainstorm some ideas here:
 
 **Creative Angles:**
 1. What if we approached this from first principles?
@@ -182,6 +138,95 @@ Thoughts on finding that balance?"""
 - Performance through clever architecture
 
 I'm excited to explore these directions. What do you think?"""
+
+
+class AgentB(BaseAgent):
+    """
+    Agent B - Creative Problem Solver and Brainstormer
+    
+    Focuses on:
+    - Alternative approaches
+    - Creative solutions
+    - Innovation and new ideas
+    - User experience perspective
+    """
+
+    __slots__ = ("persona",)
+    
+    def __init__(self, db: Database, config: dict = None):
+        super().__init__(Role.AGENT_B, db, config)
+        self.persona = "creative problem solver and brainstormer"
+    
+    def generate_response(
+        self,
+        previous_message: Message,
+        conversation_history: Optional[List[Message]] = None
+    ) -> str:
+        """
+        Generate a creative, solution-oriented response.
+        
+        Agent B takes an innovative approach to problem-solving.
+        """
+        # Get conversation context
+        context = self.get_conversation_context(
+            previous_message.session_id,
+            messages=conversation_history
+        )
+        
+        # Analyze the previous message (lowercased once, shared by the helpers)
+        content_lower = previous_message.content_lower
+        
+        # Response strategy based on message source
+        if previous_message.role is Role.HUMAN:
+            return self._respond_to_human(previous_message, content_lower)
+        elif previous_message.role is Role.AGENT_A:
+            return self._respond_to_agent_a(previous_message, context, content_lower)
+        else:
+            # Try to use RAG if available
+            rag_context = ""
+            if self.rag_chain:
+                rag_context = self.query_rag(previous_message.content)
+                
+            if rag_context:
+                return _RAG_RESPONSE_TEMPLATE.format(rag_context=rag_context)
+
+            return self._generate_default_response(previous_message)
+    
+    def _respond_to_human(self, message: Message, content_lower: str) -> str:
+        """Respond to human moderator input."""
+        content = message.content
+        
+        # Check if it's a redirection
+        if _REDIRECT_RE.search(content_lower):
+            return _REDIRECT_RESPONSE_TEMPLATE.format(content=content)
+        
+        # Default response to human
+        return _HUMAN_INPUT_RESPONSE
+    
+    def _respond_to_agent_a(self, message: Message, context: str, content_lower: str) -> str:
+        """Respond to Agent A's message."""
+        intents = {match.lastgroup for match in _INTENT_RE.finditer(content_lower)}
+        intent = next((name for name in _INTENT_PRIORITY if name in intents), None)
+        
+        # If Agent A raised concerns
+        if intent == "concern":
+            return _CONCERN_RESPONSE
+        
+        # If Agent A is being critical
+        elif intent == "critical":
+            return _CRITICAL_RESPONSE
+        
+        # If Agent A is asking questions
+        elif intent == "question":
+            return _QUESTION_RESPONSE
+        
+        # Default response to Agent A
+        else:
+            return _ANALYTICAL_RESPONSE
+    
+    def _generate_default_response(self, message: Message) -> str:
+        """Generate a default creative response."""
+        return _DEFAULT_RESPONSE
     
     def decide_signal(self, response_content: str, conversation_history: List[Message]) -> Signal:
         """
@@ -196,12 +241,14 @@ I'm excited to explore these directions. What do you think?"""
             logger.info("Agent B: Very long conversation, considering stop")
             return Signal.HANDOVER
         
+        content_lower = response_content.lower()
+        
         # If proposing to conclude
-        if any(word in response_content.lower() for word in ["conclude", "final thought", "in summary"]):
+        if _STOP_RE.search(content_lower):
             return Signal.STOP
         
         # If explicitly asking for human judgment
-        if "human" in response_content.lower() and "?" in response_content:
+        if "?" in response_content and HUMAN_MENTION_RE.search(content_lower):
             return Signal.HANDOVER
         
         # Default: continue brainstorming
@@ -2,9 +2,12 @@
 Base agent class for AI agents in the collaboration framework.
 """
 
+import asyncio
+import hashlib
+import re
 from abc import ABC, abstractmethod
-from typing import Optional
-from datetime import datetime
+from collections import OrderedDict, deque
+from typing import Deque, List, Optional, Tuple
 import logging
 
 from core.message import Message, Role, Signal
@@ -13,9 +16,31 @@ from core.database import Database
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of formatted RAG results kept per agent
+RAG_CACHE_SIZE = 256
+
+# Maximum number of (session, window size) conversation context buffers kept per agent
+CONTEXT_BUFFER_CACHE_SIZE = 128
+
+# Mentions of the human moderator in lowercased text, shared by the rule-based
+# agents; word prefixes so "humans" or "moderators" still count
+HUMAN_MENTION_RE = re.compile(r"\b(?:human|moderator)")
+
 
 class BaseAgent(ABC):
     """Abstract base class for AI agents."""
+
+    # Subclasses declare __slots__ for their own attributes (no per-instance __dict__)
+    __slots__ = (
+        "role",
+        "db",
+        "config",
+        "max_response_length",
+        "rag_chain",
+        "_rag_cache",
+        "_rag_cache_chain",
+        "_context_buffers",
+    )
     
     def __init__(self, role: Role, db: Database, config: dict = None):
         self.role = role
@@ -24,10 +49,22 @@ class BaseAgent(ABC):
         self.max_response_length = self.config.get("max_turn_length", 5000)
         self.rag_chain = None  # RAG chain for querying codebase
         
-        logger.info(f"Initialized {self.role.value}")
+        # Formatted RAG results keyed by query hash; dropped when rag_chain is replaced
+        self._rag_cache: "OrderedDict[bytes, Optional[str]]" = OrderedDict()
+        self._rag_cache_chain = None
+        
+        # Formatted context lines per (session_id, max_messages), extended as new messages arrive;
+        # least recently used sessions are dropped
+        self._context_buffers: "OrderedDict[Tuple[str, int], Tuple[Deque[int], Deque[str]]]" = OrderedDict()
+        
+        logger.info("Initialized %s", self.role.value)
     
     @abstractmethod
-    def generate_response(self, previous_message: Message) -> str:
+    def generate_response(
+        self,
+        previous_message: Message,
+        conversation_history: Optional[List[Message]] = None
+    ) -> str:
         """
         Generate a response based on the previous message.
         
@@ -36,6 +73,8 @@ class BaseAgent(ABC):
         
         Args:
             previous_message: The message to respond to
+            conversation_history: Messages already fetched for the session
+                (fetched from the database when None)
             
         Returns:
             The generated response content
@@ -66,17 +105,81 @@ class BaseAgent(ABC):
         Returns:
             A complete Message object with the agent's response
         """
-        logger.info(f"{self.role.value} processing message from {previous_message.role.value}")
+        logger.info("%s processing message from %s", self.role.value, previous_message.role.value)
         
         # Get conversation history for context
         conversation_history = self.db.get_messages(previous_message.session_id)
         
-        # Generate response content
-        response_content = self.generate_response(previous_message)
+        # Generate response content (reuse the history instead of re-querying)
+        response_content = self.generate_response(
+            previous_message,
+            conversation_history=conversation_history
+        )
+        
+        return self._build_response_message(previous_message, response_content, conversation_history)
+    
+    async def respond_to_async(self, previous_message: Message) -> Message:
+        """
+        Async counterpart of respond_to.
+        
+        Lets callers overlap several agents' (or sessions') LLM round-trips,
+        e.g. with asyncio.gather.
+        
+        Args:
+            previous_message: The message to respond to
+            
+        Returns:
+            A complete Message object with the agent's response
+        """
+        logger.info("%s processing message from %s", self.role.value, previous_message.role.value)
+        
+        fetch_history = asyncio.to_thread(self.db.get_messages, previous_message.session_id)
+        
+        rag_query = self._rag_prefetch_query(previous_message) if self.rag_chain else None
+        if rag_query:
+            # Run the retrieval the response will need alongside the history fetch;
+            # generate_response then gets it from the RAG cache
+            conversation_history, _ = await asyncio.gather(
+                fetch_history,
+                self.query_rag_async(rag_query)
+            )
+        else:
+            conversation_history = await fetch_history
+        
+        response_content = await self.generate_response_async(
+            previous_message,
+            conversation_history=conversation_history
+        )
         
+        return self._build_response_message(previous_message, response_content, conversation_history)
+    
+    async def generate_response_async(
+        self,
+        previous_message: Message,
+        conversation_history: Optional[List[Message]] = None
+    ) -> str:
+        """
+        Async counterpart of generate_response.
+        
+        The default implementation runs generate_response in a worker thread;
+        agents with native async clients override this.
+        """
+        return await asyncio.to_thread(
+            self.generate_response,
+            previous_message,
+            conversation_history=conversation_history
+        )
+    
+    def _build_response_message(
+        self,
+        previous_message: Message,
+        response_content: str,
+        conversation_history: List[Message]
+    ) -> Message:
+        """Decide the signal and wrap the generated content in a Message."""
         # Optional: Log if response is very long (but don't truncate)
         if len(response_content) > self.max_response_length:
-            logger.info(f"{self.role.value} response is {len(response_content)} chars (longer than suggested {self.max_response_length})")
+            logger.info("%s response is %s chars (longer than suggested %s)", self.role.value, len(response_content), self.max_response_length)
         
         # Decide signal
         signal = self.decide_signal(response_content, conversation_history)
@@ -86,42 +189,91 @@ class BaseAgent(ABC):
             session_id=previous_message.session_id,
             role=self.role,
             content=response_content,
-            signal=signal,
-            timestamp=datetime.utcnow()
+            signal=signal
         )
         
-        logger.info(f"{self.role.value} generated response with signal '{signal.value}'")
+        logger.info("%s generated response with signal '%s'", self.role.value, signal.value)
         
         return message
     
-    def get_conversation_context(self, session_id: str, max_messages: Optional[int] = 10) -> str:
+    def get_conversation_context(
+        self,
+        session_id: str,
+        max_messages: Optional[int] = 10,
+        messages: Optional[List[Message]] = None
+    ) -> str:
         """
         Get formatted conversation history for context.
         
         Args:
             session_id: The session to get context from
             max_messages: Maximum number of recent messages to include (None = all messages)
+            messages: Already-fetched session messages (fetched from the database when None)
             
         Returns:
             Formatted string of conversation history
         """
-        messages = self.db.get_messages(session_id)
+        if messages is None:
+            messages = self.db.get_messages(session_id)
         
         # If max_messages is None, include ALL messages (for comprehensive summaries)
         if max_messages is None:
             recent_messages = messages
         else:
             recent_messages = messages[-max_messages:] if len(messages) > max_messages else messages
+            if recent_messages and all(msg.id is not None for msg in recent_messages):
+                return self._extend_context_buffer(session_id, max_messages, recent_messages)
         
         context = []
         for msg in recent_messages:
             context.append(f"{msg.role.value}: {msg.content}")
         
         return "\n\n".join(context)
+
+    def _extend_context_buffer(self, session_id: str, max_messages: int, recent_messages: List[Message]) -> str:
+        """
+        Format the recent window, reusing lines already formatted on earlier turns.
+
+        Only messages newer than the buffered ones are formatted; the buffer is
+        rebuilt if it no longer lines up with the stored messages.
+        """
+        key = (session_id, max_messages)
+        recent_ids = [msg.id for msg in recent_messages]
+        ids, lines = self._context_buffers.get(key, (None, None))
+        if ids is not None:
+            self._context_buffers.move_to_end(key)
+
+        new_start = None
+        if ids:
+            try:
+                last_index = recent_ids.index(ids[-1])
+            except ValueError:
+                last_index = None
+            # The buffered window must end exactly where the stored history does
+            if last_index is not None and list(ids)[-(last_index + 1):] == recent_ids[:last_index + 1]:
+                new_start = last_index + 1
+
+        if new_start is None:
+            ids = deque(maxlen=max_messages)
+            lines = deque(maxlen=max_messages)
+            new_start = 0
+            self._context_buffers[key] = (ids, lines)
+            if len(self._context_buffers) > CONTEXT_BUFFER_CACHE_SIZE:
+                self._context_buffers.popitem(last=False)
+
+        for msg in recent_messages[new_start:]:
+            ids.append(msg.id)
+            lines.append(f"{msg.role.value}: {msg.content}")
+
+        return "\n\n".join(lines)
+
     def query_rag(self, query: str) -> str:
         """
         Query the RAG system for context.
 
+        Results are cached per query, so asking the same question again (e.g.
+        on a retried turn) skips the embedding + vector search.
+
         Args:
             query: The question to ask the RAG system
 
@@ -131,8 +283,21 @@ class BaseAgent(ABC):
         if not self.rag_chain:
             return None
 
+        # Codebase was reloaded - cached results belong to the old index
+        if self._rag_cache_chain is not self.rag_chain:
+            self._rag_cache.clear()
+            self._rag_cache_chain = self.rag_chain
+
+        key = hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest()
+        if key in self._rag_cache:
+            self._rag_cache.move_to_end(key)
+            logger.info("%s RAG cache hit", self.role.value)
+            return self._rag_cache[key]
+
         try:
-            logger.info(f"{self.role.value} querying RAG: {query}")
+            # Queries can be whole messages - only echo them when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("%s querying RAG: %s", self.role.value, query)
             # Use retriever to get relevant documents directly (no LLM call)
             # Try invoke() first (LangChain new API), fallback to get_relevant_documents() (old API)
             try:
@@ -141,11 +306,36 @@ class BaseAgent(ABC):
                 docs = self.rag_chain.get_relevant_documents(query)
 
             # Format documents into readable context
-            context_parts = []
-            for i, doc in enumerate(docs, 1):
-                context_parts.append(f"[Document {i}]\n{doc.page_content}\n")
-            return "\n".join(context_parts) if context_parts else None
+            result = "\n".join(
+                f"[Document {i}]\n{doc.page_content}\n" for i, doc in enumerate(docs, 1)
+            ) or None
+
+            self._rag_cache[key] = result
+            if len(self._rag_cache) > RAG_CACHE_SIZE:
+                self._rag_cache.popitem(last=False)
+            return result
         except Exception as e:
-            logger.error(f"RAG query failed: {e}")
+            logger.error("RAG query failed: %s", e)
             return None
 
+    async def query_rag_async(self, query: str) -> Optional[str]:
+        """
+        Async counterpart of query_rag (the retriever runs in a worker thread).
+
+        Args:
+            query: The question to ask the RAG system
+
+        Returns:
+            Relevant documents from the RAG system, or None if RAG is not available
+        """
+        return await asyncio.to_thread(self.query_rag, query)
+
+    def _rag_prefetch_query(self, previous_message: Message) -> Optional[str]:
+        """
+        RAG query that generate_response will issue for this message, if known up front.
+
+        respond_to_async starts this query early so retrieval overlaps the
+        history fetch. The default (None) disables prefetching.
+        """
+        return None
+
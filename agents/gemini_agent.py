@@ -3,14 +3,29 @@ Gemini AI Agent implementation using Google's Gemini API.
 """
 
 import logging
-import google.generativeai as genai
+from typing import Iterator, Optional
 
 from agents.shared.llm_agent_base import LLMAgentBase
+from agents.shared.llm_clients import get_gemini_model
 from core.message import Role
 
 
 logger = logging.getLogger(__name__)
 
+_GENERATION_CONFIG = {
+    "temperature": 0.9,
+    "top_p": 0.95,
+    "max_output_tokens": None,
+}
+
+# Safety settings passed with every request
+_SAFETY_SETTINGS = {
+    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
+    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
+    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
+    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
+}
+
 
 class GeminiAgent(LLMAgentBase):
     """
@@ -21,6 +36,8 @@ class GeminiAgent(LLMAgentBase):
     - gemini-1.5-flash: Gemini 1.5 Flash (fast and efficient)
     - gemini-1.5-pro: Gemini 1.5 Pro (more capable)
     """
+
+    __slots__ = ("api_key", "model_name", "model")
     
     def __init__(self, role: Role, db, config: dict = None):
         super().__init__(role, db, config)
@@ -29,26 +46,23 @@ class GeminiAgent(LLMAgentBase):
         self.api_key = config.get("gemini_api_key")
         self.model_name = config.get("model", "gemini-2.0-flash-exp")  # Default to Gemini 2.0 Flash
         
-        # Initialize Gemini
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(
-            model_name=self.model_name,
-            generation_config={
-                "temperature": 0.9,
-                "top_p": 0.95,
-                "max_output_tokens": None,
-            }
+        # Initialize Gemini (model shared with other agents using the same key and model)
+        self.model = get_gemini_model(
+            self.api_key,
+            self.model_name,
+            generation_config=_GENERATION_CONFIG
         )
         
-        logger.info(f"Initialized {self.role.value} with Gemini model {self.model_name}")
+        logger.info("Initialized %s with Gemini model %s", self.role.value, self.model_name)
     
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
+    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
         """
         Call Gemini API to generate a response.
         
         Args:
             system_prompt: The system prompt
             user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
             
         Returns:
             Generated response text
@@ -56,42 +70,109 @@ class GeminiAgent(LLMAgentBase):
         Raises:
             Exception: If the API call fails
         """
-        # Combine system prompt and user prompt for Gemini (doesn't have separate system message)
-        prompt = f"""{system_prompt}
-
-{user_prompt}"""
-        
         # Call Gemini API
         response = self.model.generate_content(
-            prompt,
-            safety_settings={
-                'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-                'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-                'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-                'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-            }
+            self._build_prompt(system_prompt, user_prompt),
+            safety_settings=_SAFETY_SETTINGS,
+            generation_config={"max_output_tokens": max_tokens}
         )
         
         # Check if response was blocked
-        if not response.candidates or not response.candidates[0].content.parts:
-            finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
-            logger.warning(f"Gemini response blocked. Finish reason: {finish_reason}")
-            
+        if self._is_blocked(response):
             # Try again with simpler prompt
-            simple_prompt = f"""You are {self.role.value}. 
+            logger.info("Retrying with simplified prompt...")
+            response = self.model.generate_content(
+                self._build_fallback_prompt(),
+                safety_settings=_SAFETY_SETTINGS
+            )
+        
+        return response.text.strip()
 
-Respond naturally and briefly (150-200 words)."""
+    def _stream_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream Gemini API response chunks.
+        
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
+            
+        Yields:
+            Response text chunks
             
+        Raises:
+            Exception: If the API call fails
+        """
+        response = self.model.generate_content(
+            self._build_prompt(system_prompt, user_prompt),
+            safety_settings=_SAFETY_SETTINGS,
+            generation_config={"max_output_tokens": max_tokens},
+            stream=True
+        )
+        
+        emitted = False
+        for chunk in response:
+            if chunk.candidates and chunk.candidates[0].content.parts:
+                emitted = True
+                yield chunk.text
+        
+        # Nothing usable came back - fall back to the simplified prompt like _call_llm
+        if not emitted:
+            logger.warning("Gemini stream blocked or empty")
             logger.info("Retrying with simplified prompt...")
-            response = self.model.generate_content(
-                simple_prompt,
-                safety_settings={
-                    'HARM_CATEGORY_HARASSMENT': 'BLOCK_NONE',
-                    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_NONE',
-                    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_NONE',
-                    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_NONE',
-                }
+            yield self.model.generate_content(
+                self._build_fallback_prompt(),
+                safety_settings=_SAFETY_SETTINGS
+            ).text
+
+    async def _call_llm_async(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call Gemini API asynchronously (same flow as _call_llm).
+        
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
+            
+        Returns:
+            Generated response text
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        response = await self.model.generate_content_async(
+            self._build_prompt(system_prompt, user_prompt),
+            safety_settings=_SAFETY_SETTINGS,
+            generation_config={"max_output_tokens": max_tokens}
+        )
+        
+        if self._is_blocked(response):
+            logger.info("Retrying with simplified prompt...")
+            response = await self.model.generate_content_async(
+                self._build_fallback_prompt(),
+                safety_settings=_SAFETY_SETTINGS
             )
         
         return response.text.strip()
 
+    @staticmethod
+    def _build_prompt(system_prompt: str, user_prompt: str) -> str:
+        """Combine system prompt and user prompt (Gemini doesn't have a separate system message)."""
+        return f"""{system_prompt}
+
+{user_prompt}"""
+
+    def _build_fallback_prompt(self) -> str:
+        """Simpler prompt used when the first response was blocked."""
+        return f"""You are {self.role.value}. 
+
+Respond naturally and briefly (150-200 words)."""
+
+    @staticmethod
+    def _is_blocked(response) -> bool:
+        """Check if a response was blocked (no candidates or empty content)."""
+        if not response.candidates or not response.candidates[0].content.parts:
+            finish_reason = response.candidates[0].finish_reason if response.candidates else "UNKNOWN"
+            logger.warning("Gemini response blocked. Finish reason: %s", finish_reason)
+            return True
+        return False
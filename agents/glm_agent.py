@@ -4,9 +4,10 @@ Supports GLM-4.6 and GLM-4.5-air models.
 """
 
 import logging
-from openai import OpenAI
+from typing import Iterator, Optional
 
 from agents.shared.llm_agent_base import LLMAgentBase
+from agents.shared.llm_clients import get_async_openai_client, get_openai_client
 from core.message import Role
 
 
@@ -21,6 +22,8 @@ class GLMAgent(LLMAgentBase):
     - glm-4.6: GLM-4.6 model (most capable)
     - glm-4-flash: Faster responses (if available)
     """
+
+    __slots__ = ("api_key", "base_url", "model", "client")
     
     def __init__(self, role: Role, db, config: dict = None):
         super().__init__(role, db, config)
@@ -30,21 +33,32 @@ class GLMAgent(LLMAgentBase):
         self.base_url = config.get("z_ai_base_url", "https://api.z.ai/api/coding/paas/v4")
         self.model = config.get("model", "glm-4.6")  # Default to GLM-4.5
         
-        # Create OpenAI client with z.ai endpoint
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url=self.base_url
-        )
+        # OpenAI client with z.ai endpoint, shared with other agents using the same credentials
+        self.client = get_openai_client(self.api_key, self.base_url)
         
-        logger.info(f"Initialized {self.role.value} with model {self.model}")
+        logger.info("Initialized %s with model %s", self.role.value, self.model)
     
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
+    def _completion_kwargs(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int]) -> dict:
+        """Chat completion parameters shared by the sync, streaming and async calls."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": max_tokens,  # None allows detailed arguments
+            "temperature": 0.9,  # Higher temperature for more varied, spirited debate
+            "top_p": 0.95  # Allow more diverse responses
+        }
+
+    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
         """
         Call GLM API via OpenAI-compatible interface to generate a response.
         
         Args:
             system_prompt: The system prompt
             user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
             
         Returns:
             Generated response text
@@ -53,14 +67,53 @@ class GLMAgent(LLMAgentBase):
             Exception: If the API call fails
         """
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=None,  # Allow detailed arguments
-            temperature=0.9,  # Higher temperature for more varied, spirited debate
-            top_p=0.95  # Allow more diverse responses
+            **self._completion_kwargs(system_prompt, user_prompt, max_tokens)
+        )
+        
+        return response.choices[0].message.content.strip()
+
+    def _stream_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream GLM API response chunks (same parameters as _call_llm, see _completion_kwargs).
+        
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
+            
+        Yields:
+            Response text chunks
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        stream = self.client.chat.completions.create(
+            **self._completion_kwargs(system_prompt, user_prompt, max_tokens),
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
+    async def _call_llm_async(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call GLM API with the async client (same parameters as _call_llm, see _completion_kwargs).
+        
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
+            
+        Returns:
+            Generated response text
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        async_client = get_async_openai_client(self.api_key, self.base_url)
+        response = await async_client.chat.completions.create(
+            **self._completion_kwargs(system_prompt, user_prompt, max_tokens)
         )
         
         return response.choices[0].message.content.strip()
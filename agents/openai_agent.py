@@ -4,9 +4,10 @@ Works with OpenAI API and any OpenAI-compatible endpoints.
 """
 
 import logging
-from openai import OpenAI
+from typing import Iterator, Optional
 
 from agents.shared.llm_agent_base import LLMAgentBase
+from agents.shared.llm_clients import get_async_openai_client, get_openai_client
 from core.message import Role
 
 
@@ -26,6 +27,8 @@ class OpenAIAgent(LLMAgentBase):
     - openai_base_url: (Optional) Base URL for API endpoint. Defaults to OpenAI's official endpoint.
     - model: Model name (e.g., "gpt-4", "gpt-3.5-turbo")
     """
+
+    __slots__ = ("api_key", "base_url", "model", "client")
     
     def __init__(self, role: Role, db, config: dict = None):
         super().__init__(role, db, config)
@@ -35,25 +38,35 @@ class OpenAIAgent(LLMAgentBase):
         self.base_url = config.get("openai_base_url")  # Optional, defaults to OpenAI
         self.model = config.get("model", "gpt-5")  # Default to GPT-5
         
-        # Create OpenAI client
-        client_kwargs = {"api_key": self.api_key}
-        if self.base_url:
-            client_kwargs["base_url"] = self.base_url
-        
-        self.client = OpenAI(**client_kwargs)
+        # OpenAI client, shared with other agents using the same credentials
+        self.client = get_openai_client(self.api_key, self.base_url)
         
         logger.info(
-            f"Initialized {self.role.value} with OpenAI-compatible model {self.model}"
-            + (f" at {self.base_url}" if self.base_url else "")
+            "Initialized %s with OpenAI-compatible model %s%s",
+            self.role.value, self.model, f" at {self.base_url}" if self.base_url else ""
         )
     
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
+    def _completion_kwargs(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int]) -> dict:
+        """Chat completion parameters shared by the sync, streaming and async calls."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            "max_tokens": max_tokens,  # None allows detailed responses
+            "temperature": 0.9,  # Higher temperature for more varied, spirited debate
+            "top_p": 0.95  # Allow more diverse responses
+        }
+
+    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
         """
         Call OpenAI or OpenAI-compatible API to generate a response.
         
         Args:
             system_prompt: The system prompt
             user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
             
         Returns:
             Generated response text
@@ -62,14 +75,53 @@ class OpenAIAgent(LLMAgentBase):
             Exception: If the API call fails
         """
         response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            max_tokens=None,  # Allow detailed responses
-            temperature=0.9,  # Higher temperature for more varied, spirited debate
-            top_p=0.95  # Allow more diverse responses
+            **self._completion_kwargs(system_prompt, user_prompt, max_tokens)
+        )
+        
+        return response.choices[0].message.content.strip()
+
+    def _stream_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream OpenAI API response chunks (same parameters as _call_llm, see _completion_kwargs).
+        
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
+            
+        Yields:
+            Response text chunks
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        stream = self.client.chat.completions.create(
+            **self._completion_kwargs(system_prompt, user_prompt, max_tokens),
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content or ""
+
+    async def _call_llm_async(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call OpenAI API with the async client (same parameters as _call_llm, see _completion_kwargs).
+        
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = no cap)
+            
+        Returns:
+            Generated response text
+            
+        Raises:
+            Exception: If the API call fails
+        """
+        async_client = get_async_openai_client(self.api_key, self.base_url)
+        response = await async_client.chat.completions.create(
+            **self._completion_kwargs(system_prompt, user_prompt, max_tokens)
         )
         
         return response.choices[0].message.content.strip()
@@ -7,11 +7,15 @@ Key design:
 - Human messages can interrupt/redirect the flow
 """
 
+import asyncio
 import logging
+import re
+from contextvars import ContextVar
+from functools import partial
 from typing import Optional, Callable, Tuple
-from datetime import datetime
 
 from agents.planning_nodes import PlanningNodes
+from agents.shared.language_instructions import localized
 from agents.shared.language_detector import LanguageDetector
 from core.message import Message, Role, Signal
 
@@ -28,6 +32,138 @@ NODE_SEQUENCE = [
     "completed"
 ]
 
+# Neighbouring nodes in NODE_SEQUENCE
+_NEXT_NODE = dict(zip(NODE_SEQUENCE, NODE_SEQUENCE[1:]))
+_PREVIOUS_NODE = dict(zip(NODE_SEQUENCE[1:], NODE_SEQUENCE))
+
+# Nodes the workflow stops before to wait for the human (HANDOVER):
+# - After review (before validation) - checkpoint for human feedback
+# - After finalize (completed)
+_CHECKPOINT_NODES = frozenset(("validate_proposal", "completed"))
+
+# Keyword matchers for human messages (case-insensitive, so the content is not lowercased)
+_STOP_RE = re.compile(r"stop|dừng|🛑|tóm tắt|summarize", re.IGNORECASE)
+_MODIFY_RE = re.compile(r"sửa|thay đổi|modify|change|update|chỉnh", re.IGNORECASE)
+_MODIFY_ANALYSIS_RE = re.compile(r"phân tích|analysis|analyze", re.IGNORECASE)
+_MODIFY_PROPOSAL_RE = re.compile(r"đề xuất|proposal|propose", re.IGNORECASE)
+_MODIFY_REVIEW_RE = re.compile(r"review|xem xét", re.IGNORECASE)
+
+
+# User-facing texts per session language (anything but Vietnamese uses English)
+_SUMMARY_TEMPLATES = {
+    "vietnamese": """## 📋 Tóm tắt kế hoạch
+
+### Yêu cầu ban đầu:
+{request}
+
+### Phân tích codebase (Agent A):
+{analysis}...
+
+### Đề xuất (Agent A):
+{proposal}...
+
+### Xem xét (Agent B):
+{review}...
+
+### File liên quan:
+{files}
+
+---
+⛔ Kế hoạch đã dừng theo yêu cầu.""",
+    "english": """## 📋 Plan Summary
+
+### Original Request:
+{request}
+
+### Codebase Analysis (Agent A):
+{analysis}...
+
+### Proposal (Agent A):
+{proposal}...
+
+### Review (Agent B):
+{review}...
+
+### Related Files:
+{files}
+
+---
+⛔ Planning stopped as requested.""",
+}
+
+# Summary placeholders for (missing request, unfinished step, no files)
+_SUMMARY_MISSING = {
+    "vietnamese": ("Không có", "Chưa hoàn thành", "- Chưa xác định"),
+    "english": ("None", "Not completed", "- Not identified"),
+}
+
+_MODIFICATION_ACKS = {
+    "vietnamese": "✅ Đã nhận phản hồi. Sẽ quay lại bước '{node}' với thông tin mới.",
+    "english": "✅ Feedback received. Will go back to '{node}' step with new information.",
+}
+
+_RESTART_ACKS = {
+    "vietnamese": "✅ Đã nhận góp ý. Bắt đầu vòng thảo luận mới với context đầy đủ.",
+    "english": "✅ Input received. Starting new discussion round with full context.",
+}
+
+_CONTINUE_ACKS = {
+    "vietnamese": "✅ Đã nhận góp ý. Tiếp tục với bước hiện tại.",
+    "english": "✅ Input received. Continuing with current step.",
+}
+
+_COMPLETION_TEXTS = {
+    "vietnamese": "✅ Kế hoạch đã hoàn thành. Bạn có thể bắt đầu thực hiện hoặc yêu cầu điều chỉnh.",
+    "english": "✅ Planning completed. You can start implementation or request modifications.",
+}
+
+_ERROR_TEMPLATES = {
+    "vietnamese": "❌ Lỗi khi thực hiện bước lập kế hoạch: {error}",
+    "english": "❌ Error during planning step: {error}",
+}
+
+
+# Node -> (speaking agent, state field shown, message prefix per language);
+# validate_proposal has no field - its message is built from the validation result
+_NODE_MESSAGES = {
+    "analyze_codebase": (
+        Role.AGENT_A, "agent_a_analysis",
+        {"vietnamese": "[Agent A - Phân tích]", "english": "[Agent A - Analysis]"},
+    ),
+    "propose_changes": (
+        Role.AGENT_A, "agent_a_proposal",
+        {"vietnamese": "[Agent A - Đề xuất]", "english": "[Agent A - Proposal]"},
+    ),
+    "review_and_refine": (
+        Role.AGENT_B, "agent_b_review",
+        {"vietnamese": "[Agent B - Xem xét]", "english": "[Agent B - Review]"},
+    ),
+    "validate_proposal": (
+        Role.AGENT_A, None,
+        {"vietnamese": "[Kiểm tra]", "english": "[Validation]"},
+    ),
+    "finalize_plan": (
+        Role.AGENT_A, "final_plan",
+        {"vietnamese": "[Kế hoạch cuối cùng]", "english": "[Final Plan]"},
+    ),
+}
+
+_VALIDATION_PASSED_TEXTS = {
+    "vietnamese": "✅ Đề xuất đã qua kiểm tra",
+    "english": "✅ Proposal validated",
+}
+
+# Followed by one "- issue" line per validation issue
+_VALIDATION_FAILED_HEADERS = {
+    "vietnamese": "⚠️ Cần điều chỉnh:\n",
+    "english": "⚠️ Needs adjustment:\n",
+}
+
+
+# Session the LLM callers build their prompt messages for (set per turn; a
+# context variable so concurrent async turns don't see each other's session)
+_current_session_id: ContextVar[str] = ContextVar("planning_session_id", default="planning-session")
+
 
 class TurnBasedPlanningWorkflow:
     """
@@ -55,50 +191,20 @@ class TurnBasedPlanningWorkflow:
         self.agent_a = agent_a
         self.agent_b = agent_b
 
-        # Create LLM callers that use generate_response for dynamic prompts
-        def llm_caller_a(system_prompt: str, user_prompt: str) -> str:
-            # Create a fake message to trigger generate_response
-            from core.message import Message, Signal
-            from datetime import datetime
-
-            # Extract session_id from context if available, otherwise use dummy
-            session_id = getattr(llm_caller_a, '_current_session_id', 'planning-session')
-
-            fake_message = Message(
-                session_id=session_id,
-                role=Role.HUMAN,
-                content=user_prompt,
-                signal=Signal.CONTINUE,
-                timestamp=datetime.utcnow()
-            )
-
-            # Use generate_response with skip_rag=True (planning_nodes already queried RAG)
-            return agent_a.generate_response(fake_message, skip_rag=True)
-
-        def llm_caller_b(system_prompt: str, user_prompt: str) -> str:
-            # Create a fake message to trigger generate_response
-            from core.message import Message, Signal
-            from datetime import datetime
-
-            session_id = getattr(llm_caller_b, '_current_session_id', 'planning-session')
-
-            fake_message = Message(
-                session_id=session_id,
-                role=Role.HUMAN,
-                content=user_prompt,
-                signal=Signal.CONTINUE,
-                timestamp=datetime.utcnow()
-            )
-
-            # Use generate_response with skip_rag=True (planning_nodes already queried RAG)
-            return agent_b.generate_response(fake_message, skip_rag=True)
-
-        # Store references for session_id injection
-        self.llm_caller_a = llm_caller_a
-        self.llm_caller_b = llm_caller_b
+        # LLM callers that go through generate_response for dynamic prompts
+        self.llm_caller_a = partial(self._call_agent, agent_a)
+        self.llm_caller_b = partial(self._call_agent, agent_b)
+        self.async_llm_caller_a = partial(self._call_agent_async, agent_a)
+        self.async_llm_caller_b = partial(self._call_agent_async, agent_b)
 
         # Initialize nodes
-        self.nodes = PlanningNodes(rag_chain, llm_caller_a, llm_caller_b)
+        self.nodes = PlanningNodes(
+            rag_chain,
+            self.llm_caller_a,
+            self.llm_caller_b,
+            async_llm_caller_a=self.async_llm_caller_a,
+            async_llm_caller_b=self.async_llm_caller_b
+        )
 
         # Map node names to functions
         self.node_functions = {
@@ -108,6 +214,33 @@ class TurnBasedPlanningWorkflow:
             "validate_proposal": self.nodes.validate_proposal,
             "finalize_plan": self.nodes.finalize_plan,
         }
+        self.async_node_functions = {
+            "analyze_codebase": self.nodes.analyze_codebase_async,
+            "propose_changes": self.nodes.propose_changes_async,
+            "review_and_refine": self.nodes.review_and_refine_async,
+        }
+
+    @staticmethod
+    def _prompt_message(user_prompt: str) -> Message:
+        """
+        Wrap a node's user prompt in a human message so the agent's
+        generate_response builds its dynamic prompts around it.
+        """
+        return Message(
+            session_id=_current_session_id.get(),
+            role=Role.HUMAN,
+            content=user_prompt,
+            signal=Signal.CONTINUE
+        )
+
+    def _call_agent(self, agent, system_prompt: str, user_prompt: str) -> str:
+        """Call an agent's LLM for a planning node."""
+        # Use generate_response with skip_rag=True (planning_nodes already queried RAG)
+        return agent.generate_response(self._prompt_message(user_prompt), skip_rag=True)
+
+    async def _call_agent_async(self, agent, system_prompt: str, user_prompt: str) -> str:
+        """Async counterpart of _call_agent."""
+        return await agent.generate_response_async(self._prompt_message(user_prompt), skip_rag=True)
 
     def initialize_state(self, session_id: str, request: str, language: str = "english") -> dict:
         """Initialize planning state for a new session."""
@@ -138,88 +271,172 @@ class TurnBasedPlanningWorkflow:
             return state
         return self.initialize_state(session_id, request, language)
 
-    def execute_one_turn(self, session_id: str, human_message: Optional[Message] = None) -> Tuple[dict, Message]:
+    def execute_one_turn(
+        self,
+        session_id: str,
+        human_message: Optional[Message] = None,
+        state: Optional[dict] = None
+    ) -> Tuple[dict, Message]:
         """
         Execute ONE turn in the planning workflow.
 
         Args:
             session_id: Session ID
             human_message: Optional human message that triggered this turn
+            state: State returned by the previous turn, as saved (loaded from the database when None)
 
         Returns:
             Tuple of (updated state, response message)
         """
-        # Get current state
-        state = self.db.get_planning_state(session_id)
-        if not state:
-            logger.error(f"No planning state found for session {session_id}")
-            return None, None
+        state, early_result = self._begin_turn(session_id, human_message, state)
+        if early_result is not None:
+            return early_result
 
-        state["messages"] = []  # Reset messages for this turn
         current_node = state.get("current_node", "analyze_codebase")
-
-        # Check if human interrupted
-        if human_message and human_message.role == Role.HUMAN:
-            return self._handle_human_interrupt(state, human_message)
-
-        # Check if already completed
-        if current_node == "completed":
-            logger.info(f"[Planning] Session {session_id} already completed")
-            return state, self._create_completion_message(state)
-
-        # Execute current node
-        logger.info(f"[Planning] Executing node: {current_node}")
         node_func = self.node_functions.get(current_node)
         if not node_func:
-            logger.error(f"Unknown node: {current_node}")
+            logger.error("Unknown node: %s", current_node)
             return state, None
 
+        # Session used by the LLM callers for dynamic prompts; reset afterwards so
+        # it does not leak into the caller's context
+        session_token = _current_session_id.set(session_id)
         try:
-            # Inject session_id into LLM callers for dynamic prompts
-            self.llm_caller_a._current_session_id = session_id
-            self.llm_caller_b._current_session_id = session_id
-
             # Execute node
-            logger.info(f"[Planning] >>> Executing node function: {current_node}")
-            updated_state = node_func(state)
-            logger.info(f"[Planning] <<< Node function completed: {current_node}")
+            logger.info("[Planning] >>> Executing node function: %s", current_node)
+            changes = node_func(state)
+            logger.info("[Planning] <<< Node function completed: %s", current_node)
+
+            return self._finish_turn(session_id, state, changes, current_node)
 
-            # Get next node
-            next_node = self._get_next_node(current_node)
-            updated_state["current_node"] = next_node
-            logger.info(f"[Planning] Node {current_node} completed. Next node will be: {next_node}")
+        except Exception as e:
+            logger.error("[Planning] Node %s failed: %s", current_node, e, exc_info=True)
+            error_msg = self._create_error_message(state, str(e))
+            return state, error_msg
 
-            # Save state to database
-            self.db.save_planning_state(session_id, updated_state)
+        finally:
+            _current_session_id.reset(session_token)
 
-            # Create response message
-            response_message = self._create_node_message(updated_state, current_node)
-            logger.info(f"[Planning] Response signal: {response_message.signal.value}")
-            return updated_state, response_message
+    async def execute_one_turn_async(
+        self,
+        session_id: str,
+        human_message: Optional[Message] = None,
+        state: Optional[dict] = None
+    ) -> Tuple[dict, Message]:
+        """
+        Async counterpart of execute_one_turn.
+
+        LLM-backed nodes await the agents' async clients; database work and
+        the local nodes (validation, final plan) run in a worker thread.
+        """
+        state, early_result = await asyncio.to_thread(self._begin_turn, session_id, human_message, state)
+        if early_result is not None:
+            return early_result
+
+        current_node = state.get("current_node", "analyze_codebase")
+        node_func = self.async_node_functions.get(current_node)
+        if not node_func:
+            sync_node_func = self.node_functions.get(current_node)
+            if not sync_node_func:
+                logger.error("Unknown node: %s", current_node)
+                return state, None
+            node_func = partial(asyncio.to_thread, sync_node_func)
+
+        # Session used by the LLM callers for dynamic prompts; reset afterwards so
+        # it does not leak into the caller's context
+        session_token = _current_session_id.set(session_id)
+        try:
+            # Execute node
+            logger.info("[Planning] >>> Executing node function: %s", current_node)
+            changes = await node_func(state)
+            logger.info("[Planning] <<< Node function completed: %s", current_node)
+
+            return await asyncio.to_thread(self._finish_turn, session_id, state, changes, current_node)
 
         except Exception as e:
-            logger.error(f"[Planning] Node {current_node} failed: {e}", exc_info=True)
+            logger.error("[Planning] Node %s failed: %s", current_node, e, exc_info=True)
             error_msg = self._create_error_message(state, str(e))
             return state, error_msg
 
+        finally:
+            _current_session_id.reset(session_token)
+
+    def _begin_turn(
+        self,
+        session_id: str,
+        human_message: Optional[Message],
+        state: Optional[dict]
+    ) -> Tuple[Optional[dict], Optional[Tuple[dict, Message]]]:
+        """
+        Load the state and handle turns that don't run a node.
+
+        Returns:
+            Tuple of (state, early result); the early result is set for a missing
+            state, a human interrupt or a completed session
+        """
+        # Get current state
+        if state is None:
+            state = self.db.get_planning_state(session_id)
+        if not state:
+            logger.error("No planning state found for session %s", session_id)
+            return None, (None, None)
+
+        state["messages"] = []  # Reset messages for this turn
+        current_node = state.get("current_node", "analyze_codebase")
+
+        # Check if human interrupted
+        if human_message and human_message.role == Role.HUMAN:
+            return state, self._handle_human_interrupt(state, human_message)
+
+        # Check if already completed
+        if current_node == "completed":
+            logger.info("[Planning] Session %s already completed", session_id)
+            return state, (state, self._create_completion_message(state))
+
+        logger.info("[Planning] Executing node: %s", current_node)
+        return state, None
+
+    def _finish_turn(
+        self,
+        session_id: str,
+        state: dict,
+        changes: dict,
+        current_node: str
+    ) -> Tuple[dict, Message]:
+        """Merge the node's changes into the state, advance to the next node and save it."""
+        # Get next node
+        next_node = self._get_next_node(current_node)
+        changes["current_node"] = next_node
+        state.update(changes)
+        logger.info("[Planning] Node %s completed. Next node will be: %s", current_node, next_node)
+
+        # Save only the fields the node set; fall back to a full save if needed
+        if not self.db.update_planning_state(session_id, changes):
+            self.db.save_planning_state(session_id, state)
+
+        # Create response message
+        response_message = self._create_node_message(state, current_node)
+        logger.info("[Planning] Response signal: %s", response_message.signal.value)
+        return state, response_message
+
     def _handle_human_interrupt(self, state: dict, human_message: Message) -> Tuple[dict, Message]:
         """Handle human interruption during planning."""
         session_id = state["session_id"]
-        content = human_message.content.lower()
+        content = human_message.content
         language = state.get("language", "english")
 
         # Check for STOP request
-        if any(kw in content for kw in ['stop', 'dừng', '🛑', 'tóm tắt', 'summarize']):
-            logger.info(f"[Planning] Human requested STOP")
+        if _STOP_RE.search(content):
+            logger.info("[Planning] Human requested STOP")
             return self._generate_summary(state, human_message)
 
         # Check for feedback/modification request
-        if any(kw in content for kw in ['sửa', 'thay đổi', 'modify', 'change', 'update', 'chỉnh']):
-            logger.info(f"[Planning] Human requested modification")
+        if _MODIFY_RE.search(content):
+            logger.info("[Planning] Human requested modification")
             return self._handle_modification(state, human_message)
 
         # Default: incorporate human input and continue
-        logger.info(f"[Planning] Human input received, incorporating into current step")
+        logger.info("[Planning] Human input received, incorporating into current step")
         return self._incorporate_human_input(state, human_message)
 
     def _generate_summary(self, state: dict, human_message: Message) -> Tuple[dict, Message]:
@@ -227,47 +444,19 @@ class TurnBasedPlanningWorkflow:
         language = state.get("language", "english")
         session_id = state["session_id"]
 
-        # Build summary from current state
-        if language == 'vietnamese':
-            summary = f"""## 📋 Tóm tắt kế hoạch
-
-### Yêu cầu ban đầu:
-{state.get('request', 'Không có')}
-
-### Phân tích codebase (Agent A):
-{state.get('agent_a_analysis', 'Chưa hoàn thành')[:500]}...
+        # Related files, one bullet per line
+        file_lines = "\n".join([f"- {f}" for f in state.get('identified_files') or ()])
 
-### Đề xuất (Agent A):
-{state.get('agent_a_proposal', 'Chưa hoàn thành')[:500]}...
-
-### Xem xét (Agent B):
-{state.get('agent_b_review', 'Chưa hoàn thành')[:500]}...
-
-### File liên quan:
-{chr(10).join(f'- {f}' for f in state.get('identified_files', [])) or '- Chưa xác định'}
-
----
-⛔ Kế hoạch đã dừng theo yêu cầu."""
-        else:
-            summary = f"""## 📋 Plan Summary
-
-### Original Request:
-{state.get('request', 'None')}
-
-### Codebase Analysis (Agent A):
-{state.get('agent_a_analysis', 'Not completed')[:500]}...
-
-### Proposal (Agent A):
-{state.get('agent_a_proposal', 'Not completed')[:500]}...
-
-### Review (Agent B):
-{state.get('agent_b_review', 'Not completed')[:500]}...
-
-### Related Files:
-{chr(10).join(f'- {f}' for f in state.get('identified_files', [])) or '- Not identified'}
-
----
-⛔ Planning stopped as requested."""
+        # Build summary from current state
+        missing_request, not_completed, no_files = localized(_SUMMARY_MISSING, language)
+        # Stored states keep unfinished steps as "", so fall back on falsy values
+        summary = localized(_SUMMARY_TEMPLATES, language).format(
+            request=state.get('request') or missing_request,
+            analysis=(state.get('agent_a_analysis') or not_completed)[:500],
+            proposal=(state.get('agent_a_proposal') or not_completed)[:500],
+            review=(state.get('agent_b_review') or not_completed)[:500],
+            files=file_lines or no_files
+        )
 
         # Mark as completed
         state["current_node"] = "completed"
@@ -291,22 +480,20 @@ class TurnBasedPlanningWorkflow:
         current_node = state.get("current_node", "analyze_codebase")
 
         # Determine which step to go back to based on what human wants to modify
-        content = human_message.content.lower()
+        content = human_message.content
 
-        if any(kw in content for kw in ['phân tích', 'analysis', 'analyze']):
+        if _MODIFY_ANALYSIS_RE.search(content):
             state["current_node"] = "analyze_codebase"
             state["agent_a_analysis"] = ""
-        elif any(kw in content for kw in ['đề xuất', 'proposal', 'propose']):
+        elif _MODIFY_PROPOSAL_RE.search(content):
             state["current_node"] = "propose_changes"
             state["agent_a_proposal"] = ""
-        elif any(kw in content for kw in ['review', 'xem xét']):
+        elif _MODIFY_REVIEW_RE.search(content):
             state["current_node"] = "review_and_refine"
             state["agent_b_review"] = ""
         else:
-            # Default: go back one step
-            current_idx = NODE_SEQUENCE.index(current_node) if current_node in NODE_SEQUENCE else 0
-            if current_idx > 0:
-                state["current_node"] = NODE_SEQUENCE[current_idx - 1]
+            # Default: go back one step (stay on the first node)
+            state["current_node"] = _PREVIOUS_NODE.get(current_node, current_node)
 
         # Append human's modification to request
         state["request"] = f"{state.get('request', '')}\n\n[Bổ sung từ human]: {human_message.content}"
@@ -314,10 +501,7 @@ class TurnBasedPlanningWorkflow:
         self.db.save_planning_state(session_id, state)
 
         # Create acknowledgment message
-        if language == 'vietnamese':
-            ack = f"✅ Đã nhận phản hồi. Sẽ quay lại bước '{state['current_node']}' với thông tin mới."
-        else:
-            ack = f"✅ Feedback received. Will go back to '{state['current_node']}' step with new information."
+        ack = localized(_MODIFICATION_ACKS, language).format(node=state['current_node'])
 
         response = Message(
             session_id=session_id,
@@ -339,20 +523,14 @@ class TurnBasedPlanningWorkflow:
 
         # If at completed node, RESTART workflow from beginning with full context
         if current_node == "completed":
-            logger.info(f"[Planning] At completed node - restarting workflow from beginning with new input")
+            logger.info("[Planning] At completed node - restarting workflow from beginning with new input")
             state["current_node"] = "analyze_codebase"  # Restart from first node
             # Keep all previous context (agent_a_analysis, agent_b_review, etc.) for reference
 
-            if language == 'vietnamese':
-                ack = f"✅ Đã nhận góp ý. Bắt đầu vòng thảo luận mới với context đầy đủ."
-            else:
-                ack = f"✅ Input received. Starting new discussion round with full context."
+            ack = localized(_RESTART_ACKS, language)
         else:
             # For other nodes, continue with current step
-            if language == 'vietnamese':
-                ack = f"✅ Đã nhận góp ý. Tiếp tục với bước hiện tại."
-            else:
-                ack = f"✅ Input received. Continuing with current step."
+            ack = localized(_CONTINUE_ACKS, language)
 
         self.db.save_planning_state(session_id, state)
 
@@ -367,11 +545,7 @@ class TurnBasedPlanningWorkflow:
 
     def _get_next_node(self, current_node: str) -> str:
         """Get the next node in sequence."""
-        try:
-            idx = NODE_SEQUENCE.index(current_node)
-            return NODE_SEQUENCE[idx + 1] if idx + 1 < len(NODE_SEQUENCE) else "completed"
-        except ValueError:
-            return "completed"
+        return _NEXT_NODE.get(current_node, "completed")
 
     def _create_node_message(self, state: dict, node_name: str) -> Message:
         """Create a message from node execution result."""
@@ -379,49 +553,25 @@ class TurnBasedPlanningWorkflow:
         language = state.get("language", "english")
 
         # Determine which agent and content based on node
-        if node_name in ["analyze_codebase", "propose_changes"]:
-            role = Role.AGENT_A
-            if node_name == "analyze_codebase":
-                content = state.get("agent_a_analysis", "")
-                prefix = "[Agent A - Phân tích]" if language == 'vietnamese' else "[Agent A - Analysis]"
-            else:
-                content = state.get("agent_a_proposal", "")
-                prefix = "[Agent A - Đề xuất]" if language == 'vietnamese' else "[Agent A - Proposal]"
-        elif node_name == "review_and_refine":
-            role = Role.AGENT_B
-            content = state.get("agent_b_review", "")
-            prefix = "[Agent B - Xem xét]" if language == 'vietnamese' else "[Agent B - Review]"
-        elif node_name == "validate_proposal":
-            role = Role.AGENT_A
-            passed = state.get("validation_passed", False)
-            issues = state.get("validation_issues", [])
-            if passed:
-                content = "✅ Đề xuất đã qua kiểm tra" if language == 'vietnamese' else "✅ Proposal validated"
-            else:
-                content = f"⚠️ Cần điều chỉnh:\n" + "\n".join(f"- {i}" for i in issues) if language == 'vietnamese' else f"⚠️ Needs adjustment:\n" + "\n".join(f"- {i}" for i in issues)
-            prefix = "[Kiểm tra]" if language == 'vietnamese' else "[Validation]"
-        else:  # finalize_plan
-            role = Role.AGENT_A
-            content = state.get("final_plan", "")
-            prefix = "[Kế hoạch cuối cùng]" if language == 'vietnamese' else "[Final Plan]"
+        role, content_key, prefixes = _NODE_MESSAGES.get(node_name, _NODE_MESSAGES["finalize_plan"])
+        prefix = localized(prefixes, language)
+        if content_key is not None:
+            content = state.get(content_key, "")
+        elif state.get("validation_passed", False):
+            content = localized(_VALIDATION_PASSED_TEXTS, language)
+        else:
+            issue_lines = "\n".join([f"- {i}" for i in state.get("validation_issues", [])])
+            content = localized(_VALIDATION_FAILED_HEADERS, language) + issue_lines
 
         # Determine signal based on next node
         # CONTINUE = auto-proceed to next node
         # HANDOVER = wait for human input (only at certain checkpoints)
         next_node = state.get("current_node", "completed")
-        logger.info(f"[Planning] Signal logic: next_node={next_node}, checking against ['validate_proposal', 'completed']")
-
-        # Auto-continue between nodes, HANDOVER only at:
-        # - After review (before validation) - checkpoint for human feedback
-        # - After finalize (completed)
-        if next_node in ["validate_proposal", "completed"]:
-            signal = Signal.HANDOVER  # Checkpoint - wait for human
-            logger.info(f"[Planning] Signal = HANDOVER (checkpoint)")
-        else:
-            signal = Signal.CONTINUE  # Auto-proceed to next node
-            logger.info(f"[Planning] Signal = CONTINUE (auto-proceed)")
 
-        logger.info(f"[Planning] Creating message: node={node_name}, next={next_node}, signal={signal.value}")
+        # Auto-continue between nodes, HANDOVER only at checkpoints
+        signal = Signal.HANDOVER if next_node in _CHECKPOINT_NODES else Signal.CONTINUE
+
+        logger.info("[Planning] Creating message: node=%s, next=%s, signal=%s", node_name, next_node, signal.value)
 
         return Message(
             session_id=session_id,
@@ -432,11 +582,7 @@ class TurnBasedPlanningWorkflow:
 
     def _create_completion_message(self, state: dict) -> Message:
         """Create message when workflow is already completed."""
-        language = state.get("language", "english")
-        if language == 'vietnamese':
-            content = "✅ Kế hoạch đã hoàn thành. Bạn có thể bắt đầu thực hiện hoặc yêu cầu điều chỉnh."
-        else:
-            content = "✅ Planning completed. You can start implementation or request modifications."
+        content = localized(_COMPLETION_TEXTS, state.get("language", "english"))
 
         return Message(
             session_id=state["session_id"],
@@ -447,11 +593,7 @@ class TurnBasedPlanningWorkflow:
 
     def _create_error_message(self, state: dict, error: str) -> Message:
         """Create error message."""
-        language = state.get("language", "english")
-        if language == 'vietnamese':
-            content = f"❌ Lỗi khi thực hiện bước lập kế hoạch: {error}"
-        else:
-            content = f"❌ Error during planning step: {error}"
+        content = localized(_ERROR_TEMPLATES, state.get("language", "english")).format(error=error)
 
         return Message(
             session_id=state["session_id"],
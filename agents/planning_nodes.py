@@ -3,101 +3,56 @@ Planning workflow nodes for LangGraph.
 Each node represents a step in the structured planning process.
 """
 
+import asyncio
+import hashlib
 import logging
-from typing import TypedDict, Optional, List, Annotated
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from itertools import zip_longest
+from typing import Awaitable, Callable, TypedDict, Optional, List, Annotated, Set, Tuple
 from operator import add
 
+from agents.shared.language_instructions import localized
 from core.message import Role
 
 logger = logging.getLogger(__name__)
 
+# Codebase retrievals kept per PlanningNodes instance, and how long they stay fresh
+RETRIEVAL_CACHE_SIZE = 512
+RETRIEVAL_CACHE_TTL_SECONDS = 600
 
-class PlanningState(TypedDict):
-    """State schema for planning workflow."""
-    # Input
-    request: str                           # Human's original request
-    session_id: str                        # Session ID for database
-    language: str                          # Detected language
-
-    # RAG context
-    codebase_context: Annotated[List[str], add]  # RAG query results
-    identified_files: List[str]            # Files relevant to the request
-
-    # Agent proposals
-    agent_a_analysis: str                  # Agent A's codebase analysis
-    agent_a_proposal: str                  # Agent A's concrete proposal
-    agent_b_review: str                    # Agent B's review and refinements
-
-    # Validation
-    validation_passed: bool                # Did proposal pass validation?
-    validation_issues: List[str]           # Issues found during validation
-
-    # Final output
-    final_plan: str                        # Merged final plan
-    messages: Annotated[List[str], add]    # Messages to display to user
-
-
-class PlanningNodes:
-    """Node implementations for planning workflow."""
+# Retrieval queries per aspect of the request, and how many distinct documents to keep
+_RAG_QUERY_TEMPLATES = (
+    "Files related to: {request}",
+    "Functions and classes involved in: {request}",
+    "Architecture and modules around: {request}",
+)
+_RAG_MAX_DOCS = 8
 
-    def __init__(self, rag_chain, llm_caller_a, llm_caller_b):
-        """
-        Initialize planning nodes.
+# Documents from the same source whose first characters match are treated as duplicates
+_RAG_DEDUP_PREFIX_CHARS = 256
 
-        Args:
-            rag_chain: RAG chain for querying codebase
-            llm_caller_a: Function to call LLM for Agent A (system_prompt, user_prompt) -> str
-            llm_caller_b: Function to call LLM for Agent B (system_prompt, user_prompt) -> str
-        """
-        self.rag_chain = rag_chain
-        self.llm_caller_a = llm_caller_a
-        self.llm_caller_b = llm_caller_b
+# File paths mentioned in RAG documents (a directory part and a file extension)
+_PATH_RE = re.compile(r"[A-Za-z0-9_./\-]+/[A-Za-z0-9_.\-]+\.[A-Za-z0-9]{1,6}")
 
-    def analyze_codebase(self, state: PlanningState) -> PlanningState:
-        """
-        Node 1: Analyze codebase using RAG.
-        MUST query RAG before any proposal can be made.
-        """
-        request = state["request"]
-        language = state.get("language", "english")
+# Vague wording that marks a proposal as too abstract (reported in this order)
+_ABSTRACT_KEYWORDS = (
+    "advanced", "best practice", "modern", "industry standard",
+    "could consider", "might want to", "possibly", "perhaps",
+    "tiên tiến", "hiện đại", "có thể xem xét", "nên cân nhắc"
+)
+_ABSTRACT_RE = re.compile("|".join(map(re.escape, _ABSTRACT_KEYWORDS)), re.IGNORECASE)
 
-        logger.info(f"[Planning] Analyzing codebase for: {request[:100]}...")
+# A path separator or a source file extension (.py, .ts/.tsx, .js) in a proposal
+_FILE_HINT_RE = re.compile(r"/|\.(?:py|ts|js)")
 
-        # Single RAG query combining all aspects
-        combined_query = f"Analyze codebase for: {request}. Show related files, functions, architecture, and implementation details."
 
-        context_results = []
-        identified_files = set()
-
-        if self.rag_chain:
-            try:
-                # Use retriever to get documents directly (no LLM call)
-                # Try invoke() first (LangChain new API), fallback to get_relevant_documents() (old API)
-                try:
-                    docs = self.rag_chain.invoke(combined_query)
-                except AttributeError:
-                    docs = self.rag_chain.get_relevant_documents(combined_query)
-
-                # Format documents into readable context
-                for i, doc in enumerate(docs, 1):
-                    answer = f"[Document {i}]\n{doc.page_content}\n"
-                    context_results.append(answer)
-                    # Extract file paths from RAG results
-                    for line in doc.page_content.split('\n'):
-                        if '/' in line and ('.' in line.split('/')[-1]):
-                            # Likely a file path
-                            parts = line.split()
-                            for part in parts:
-                                if '/' in part and '.' in part:
-                                    clean_path = part.strip('`"\',:;')
-                                    if clean_path:
-                                        identified_files.add(clean_path)
-            except Exception as e:
-                logger.warning(f"RAG query failed: {e}")
-
-        # Generate analysis summary using Agent A
-        if language == 'vietnamese':
-            system_prompt = """Bạn là Agent A - chuyên gia phân tích code.
+# LLM prompts per session language (anything but Vietnamese uses English)
+_ANALYSIS_SYSTEM_PROMPTS = {
+    "vietnamese": """Bạn là Agent A - chuyên gia phân tích code.
 Nhiệm vụ: Phân tích codebase dựa trên thông tin từ RAG và yêu cầu của người dùng.
 Chỉ dựa vào thông tin thực tế từ codebase, KHÔNG đoán mò.
 
@@ -117,63 +72,37 @@ BẮT BUỘC trả lời HOÀN TOÀN bằng tiếng Việt!
 - "safety" → dùng "an toàn"
 - "performance" → dùng "hiệu năng"
 
-Viết tự nhiên như developer Việt Nam nói chuyện."""
-            user_prompt = f"""Yêu cầu: {request}
+Viết tự nhiên như developer Việt Nam nói chuyện.""",
+    "english": """You are Agent A - a code analysis expert.
+Task: Analyze the codebase based on RAG context and user's request.
+Only use actual information from the codebase, DO NOT guess.""",
+}
+_ANALYSIS_USER_TEMPLATES = {
+    "vietnamese": """Yêu cầu: {request}
 
 Thông tin từ codebase:
-{chr(10).join(context_results) if context_results else "Không tìm thấy thông tin liên quan"}
+{context}
 
 Hãy phân tích:
 1. Những file/hàm nào liên quan đến yêu cầu này?
 2. Cấu trúc code hiện tại như thế nào?
 3. Những điểm nào cần thay đổi?
 
-Chỉ nói về những gì BẠN THỰC SỰ THẤY trong codebase. Không đề xuất "kỹ thuật tiên tiến" hay "thực hành tốt nhất" chung chung."""
-        else:
-            system_prompt = """You are Agent A - a code analysis expert.
-Task: Analyze the codebase based on RAG context and user's request.
-Only use actual information from the codebase, DO NOT guess."""
-            user_prompt = f"""Request: {request}
+Chỉ nói về những gì BẠN THỰC SỰ THẤY trong codebase. Không đề xuất "kỹ thuật tiên tiến" hay "thực hành tốt nhất" chung chung.""",
+    "english": """Request: {request}
 
 Codebase context:
-{chr(10).join(context_results) if context_results else "No relevant context found"}
+{context}
 
 Analyze:
 1. Which files/functions are related to this request?
 2. What is the current code structure?
 3. What needs to be changed?
 
-Only discuss what you ACTUALLY SEE in the codebase. Don't suggest generic "advanced techniques" or "best practices"."""
-
-        try:
-            analysis = self.llm_caller_a(system_prompt, user_prompt)
-        except Exception as e:
-            logger.error(f"LLM call failed: {e}")
-            analysis = "Unable to analyze codebase"
-
-        return {
-            **state,
-            "codebase_context": context_results,
-            "identified_files": list(identified_files),
-            "agent_a_analysis": analysis,
-            "messages": [f"[Agent A - Phân tích codebase]\n{analysis}"]
-        }
-
-    def propose_changes(self, state: PlanningState) -> PlanningState:
-        """
-        Node 2: Agent A proposes concrete changes.
-        MUST reference actual files from analysis step.
-        """
-        request = state["request"]
-        analysis = state.get("agent_a_analysis", "")
-        identified_files = state.get("identified_files", [])
-        codebase_context = state.get("codebase_context", [])
-        language = state.get("language", "english")
-
-        logger.info("[Planning] Agent A proposing changes...")
-
-        if language == 'vietnamese':
-            system_prompt = """Bạn là Agent A - chuyên gia lập kế hoạch code.
+Only discuss what you ACTUALLY SEE in the codebase. Don't suggest generic "advanced techniques" or "best practices".""",
+}
+_PROPOSAL_SYSTEM_PROMPTS = {
+    "vietnamese": """Bạn là Agent A - chuyên gia lập kế hoạch code.
 Nhiệm vụ: Đề xuất CỤ THỂ những thay đổi cần làm.
 Quy tắc QUAN TRỌNG:
 - Phải chỉ rõ file thật từ codebase
@@ -194,16 +123,24 @@ BẮT BUỘC trả lời HOÀN TOÀN bằng tiếng Việt!
 - "performance" → "hiệu năng"
 - "scaling" → "mở rộng"
 
-Viết tự nhiên như developer Việt Nam nói chuyện."""
-            user_prompt = f"""Yêu cầu: {request}
+Viết tự nhiên như developer Việt Nam nói chuyện.""",
+    "english": """You are Agent A - a code planning expert.
+Task: Propose CONCRETE changes to be made.
+IMPORTANT rules:
+- Must reference actual files from codebase
+- No generic suggestions
+- Each step must have specific file + function""",
+}
+_PROPOSAL_USER_TEMPLATES = {
+    "vietnamese": """Yêu cầu: {request}
 
 Phân tích trước đó:
 {analysis}
 
-File liên quan: {', '.join(identified_files) if identified_files else 'Chưa xác định'}
+File liên quan: {files}
 
 Thông tin codebase:
-{chr(10).join(codebase_context[:2]) if codebase_context else "Không có"}
+{context}
 
 Đề xuất kế hoạch CỤ THỂ:
 1. File nào cần sửa? Hàm nào?
@@ -220,23 +157,16 @@ Format:
 
 ### Bước 2: ...
 
-KHÔNG được nói "có thể", "nên", "tiên tiến" - chỉ nói CỤ THỂ làm gì."""
-        else:
-            system_prompt = """You are Agent A - a code planning expert.
-Task: Propose CONCRETE changes to be made.
-IMPORTANT rules:
-- Must reference actual files from codebase
-- No generic suggestions
-- Each step must have specific file + function"""
-            user_prompt = f"""Request: {request}
+KHÔNG được nói "có thể", "nên", "tiên tiến" - chỉ nói CỤ THỂ làm gì.""",
+    "english": """Request: {request}
 
 Previous analysis:
 {analysis}
 
-Related files: {', '.join(identified_files) if identified_files else 'Not identified'}
+Related files: {files}
 
 Codebase context:
-{chr(10).join(codebase_context[:2]) if codebase_context else "None"}
+{context}
 
 Propose a CONCRETE plan:
 1. Which files need changes? Which functions?
@@ -253,36 +183,10 @@ Format:
 
 ### Step 2: ...
 
-DO NOT say "could", "should", "advanced" - only say SPECIFICALLY what to do."""
-
-        try:
-            proposal = self.llm_caller_a(system_prompt, user_prompt)
-        except Exception as e:
-            logger.error(f"LLM call failed: {e}")
-            proposal = "Unable to generate proposal"
-
-        return {
-            **state,
-            "agent_a_proposal": proposal,
-            "messages": [f"[Agent A - Đề xuất]\n{proposal}"]
-        }
-
-    def review_and_refine(self, state: PlanningState) -> PlanningState:
-        """
-        Node 3: Agent B reviews and refines the proposal.
-        Focus on feasibility and missing details.
-        """
-        request = state["request"]
-        proposal = state.get("agent_a_proposal", "")
-        analysis = state.get("agent_a_analysis", "")
-        identified_files = state.get("identified_files", [])
-        codebase_context = state.get("codebase_context", [])
-        language = state.get("language", "english")
-
-        logger.info("[Planning] Agent B reviewing proposal...")
-
-        if language == 'vietnamese':
-            system_prompt = """Bạn là Agent B - chuyên gia review code.
+DO NOT say "could", "should", "advanced" - only say SPECIFICALLY what to do.""",
+}
+_REVIEW_SYSTEM_PROMPTS = {
+    "vietnamese": """Bạn là Agent B - chuyên gia review code.
 Nhiệm vụ: Xem xét đề xuất của Agent A và bổ sung/cải tiến.
 Quy tắc:
 - Kiểm tra xem đề xuất có khả thi không
@@ -303,16 +207,24 @@ BẮT BUỘC trả lời HOÀN TOÀN bằng tiếng Việt!
 - "performance" → "hiệu năng"
 - "trade-off" → "đánh đổi"
 
-Viết tự nhiên như developer Việt Nam nói chuyện."""
-            user_prompt = f"""Yêu cầu gốc: {request}
+Viết tự nhiên như developer Việt Nam nói chuyện.""",
+    "english": """You are Agent B - a code review expert.
+Task: Review Agent A's proposal and add improvements.
+Rules:
+- Check if proposal is realistic
+- Any missing files/functions?
+- Any potential issues?""",
+}
+_REVIEW_USER_TEMPLATES = {
+    "vietnamese": """Yêu cầu gốc: {request}
 
 Đề xuất của Agent A:
 {proposal}
 
-File đã xác định: {', '.join(identified_files) if identified_files else 'Chưa có'}
+File đã xác định: {files}
 
 Thông tin codebase:
-{chr(10).join(codebase_context[:2]) if codebase_context else "Không có"}
+{context}
 
 Xem xét và bổ sung:
 1. Đề xuất có khả thi không? Tại sao?
@@ -333,23 +245,16 @@ Format:
 - ...
 
 ### Đề xuất cải tiến:
-- ..."""
-        else:
-            system_prompt = """You are Agent B - a code review expert.
-Task: Review Agent A's proposal and add improvements.
-Rules:
-- Check if proposal is realistic
-- Any missing files/functions?
-- Any potential issues?"""
-            user_prompt = f"""Original request: {request}
+- ...""",
+    "english": """Original request: {request}
 
 Agent A's proposal:
 {proposal}
 
-Identified files: {', '.join(identified_files) if identified_files else 'None'}
+Identified files: {files}
 
 Codebase context:
-{chr(10).join(codebase_context[:2]) if codebase_context else "None"}
+{context}
 
 Review and add:
 1. Is the proposal feasible? Why?
@@ -370,93 +275,54 @@ Format:
 - ...
 
 ### Suggested improvements:
-- ..."""
-
-        try:
-            review = self.llm_caller_b(system_prompt, user_prompt)
-        except Exception as e:
-            logger.error(f"LLM call failed: {e}")
-            review = "Unable to generate review"
-
-        return {
-            **state,
-            "agent_b_review": review,
-            "messages": [f"[Agent B - Review]\n{review}"]
-        }
-
-    def validate_proposal(self, state: PlanningState) -> PlanningState:
-        """
-        Node 4: Validate that the proposal is concrete and realistic.
-        Reject proposals that are too abstract.
-        """
-        proposal = state.get("agent_a_proposal", "")
-        review = state.get("agent_b_review", "")
-        identified_files = state.get("identified_files", [])
-
-        logger.info("[Planning] Validating proposal...")
-
-        issues = []
-
-        # Check 1: Does proposal reference actual files?
-        if not identified_files:
-            issues.append("Không có file cụ thể nào được xác định từ codebase")
-
-        # Check 2: Does proposal have concrete steps?
-        proposal_lower = proposal.lower()
-        abstract_keywords = [
-            "advanced", "best practice", "modern", "industry standard",
-            "could consider", "might want to", "possibly", "perhaps",
-            "tiên tiến", "hiện đại", "có thể xem xét", "nên cân nhắc"
-        ]
-        for keyword in abstract_keywords:
-            if keyword in proposal_lower:
-                issues.append(f"Đề xuất chứa từ chung chung: '{keyword}'")
-
-        # Check 3: Does it have file paths?
-        has_file_reference = (
-            '/' in proposal or
-            '.py' in proposal or
-            '.ts' in proposal or
-            '.tsx' in proposal or
-            '.js' in proposal
-        )
-        if not has_file_reference:
-            issues.append("Đề xuất không chỉ rõ đường dẫn file cụ thể")
-
-        validation_passed = len(issues) == 0
-
-        return {
-            **state,
-            "validation_passed": validation_passed,
-            "validation_issues": issues
-        }
-
-    def finalize_plan(self, state: PlanningState) -> PlanningState:
-        """
-        Node 5: Merge proposals into final plan.
-        """
-        request = state["request"]
-        proposal = state.get("agent_a_proposal", "")
-        review = state.get("agent_b_review", "")
-        identified_files = state.get("identified_files", [])
-        validation_passed = state.get("validation_passed", True)
-        validation_issues = state.get("validation_issues", [])
-        language = state.get("language", "english")
-
-        logger.info("[Planning] Finalizing plan...")
-
-        if language == 'vietnamese':
-            if not validation_passed:
-                final_plan = f"""## Kế hoạch cần điều chỉnh
+- ...""",
+}
+_NO_ANALYSIS_CONTEXT = {
+    "vietnamese": "Không tìm thấy thông tin liên quan",
+    "english": "No relevant context found",
+}
+_NO_CONTEXT = {"vietnamese": "Không có", "english": "None"}
+_PROPOSAL_NO_FILES = {"vietnamese": "Chưa xác định", "english": "Not identified"}
+_REVIEW_NO_FILES = {"vietnamese": "Chưa có", "english": "None"}
+
+
+@dataclass(slots=True, frozen=True)
+class _LLMStep:
+    """An LLM-backed planning step; shared by the sync and async node variants."""
+    progress: str   # Logged (with the request) when the node starts
+    field: str      # State field that receives the LLM output
+    heading: str    # Heading of the message added to the transcript
+    fallback: str   # Output used when the LLM call fails
+
+
+_ANALYSIS_STEP = _LLMStep(
+    "Analyzing codebase for", "agent_a_analysis", "[Agent A - Phân tích codebase]", "Unable to analyze codebase"
+)
+_PROPOSAL_STEP = _LLMStep(
+    "Agent A proposing changes for", "agent_a_proposal", "[Agent A - Đề xuất]", "Unable to generate proposal"
+)
+_REVIEW_STEP = _LLMStep(
+    "Agent B reviewing proposal for", "agent_b_review", "[Agent B - Review]", "Unable to generate review"
+)
+
+
+# RAG documents quoted in the proposal/review prompts, and the characters kept from each
+_PROMPT_CONTEXT_DOCS = 2
+_PROMPT_CONTEXT_DOC_CHARS = 2000
+
+
+# Final plan per session language: when validation failed, and when it passed
+_PLAN_ADJUSTMENT_TEMPLATES = {
+    "vietnamese": """## Kế hoạch cần điều chỉnh
 
 ⚠️ Đề xuất chưa đủ cụ thể. Vấn đề:
-{chr(10).join(f'- {issue}' for issue in validation_issues)}
+{issues}
 
 ### Yêu cầu gốc:
 {request}
 
 ### File liên quan (từ codebase):
-{chr(10).join(f'- {f}' for f in identified_files) if identified_files else '- Chưa xác định được file cụ thể'}
+{files}
 
 ### Đề xuất hiện tại:
 {proposal}
@@ -465,53 +331,51 @@ Format:
 {review}
 
 ---
-Cần làm rõ hơn: file cụ thể nào, hàm nào, thay đổi gì?"""
-            else:
-                final_plan = f"""## Kế hoạch cuối cùng
+Cần làm rõ hơn: file cụ thể nào, hàm nào, thay đổi gì?""",
+    "english": """## Plan Needs Adjustment
 
-### Yêu cầu:
+⚠️ Proposal is not concrete enough. Issues:
+{issues}
+
+### Original request:
 {request}
 
-### File sẽ thay đổi:
-{chr(10).join(f'- {f}' for f in identified_files) if identified_files else '- Xem chi tiết bên dưới'}
+### Related files (from codebase):
+{files}
 
-### Kế hoạch chi tiết (Agent A):
+### Current proposal:
 {proposal}
 
-### Bổ sung từ xem xét (Agent B):
+### Review:
 {review}
 
 ---
-✅ Kế hoạch đã được kiểm tra và sẵn sàng thực hiện."""
-        else:
-            if not validation_passed:
-                final_plan = f"""## Plan Needs Adjustment
-
-⚠️ Proposal is not concrete enough. Issues:
-{chr(10).join(f'- {issue}' for issue in validation_issues)}
+Need clarification: which specific files, functions, and changes?""",
+}
+_FINAL_PLAN_TEMPLATES = {
+    "vietnamese": """## Kế hoạch cuối cùng
 
-### Original request:
+### Yêu cầu:
 {request}
 
-### Related files (from codebase):
-{chr(10).join(f'- {f}' for f in identified_files) if identified_files else '- No specific files identified'}
+### File sẽ thay đổi:
+{files}
 
-### Current proposal:
+### Kế hoạch chi tiết (Agent A):
 {proposal}
 
-### Review:
+### Bổ sung từ xem xét (Agent B):
 {review}
 
 ---
-Need clarification: which specific files, functions, and changes?"""
-            else:
-                final_plan = f"""## Final Plan
+✅ Kế hoạch đã được kiểm tra và sẵn sàng thực hiện.""",
+    "english": """## Final Plan
 
 ### Request:
 {request}
 
 ### Files to change:
-{chr(10).join(f'- {f}' for f in identified_files) if identified_files else '- See details below'}
+{files}
 
 ### Detailed plan (Agent A):
 {proposal}
@@ -520,10 +384,360 @@ Need clarification: which specific files, functions, and changes?"""
 {review}
 
 ---
-✅ Plan has been validated and is ready to execute."""
+✅ Plan has been validated and is ready to execute.""",
+}
+# File list line when no files were identified
+_PLAN_ADJUSTMENT_NO_FILES = {
+    "vietnamese": "- Chưa xác định được file cụ thể",
+    "english": "- No specific files identified",
+}
+_FINAL_PLAN_NO_FILES = {
+    "vietnamese": "- Xem chi tiết bên dưới",
+    "english": "- See details below",
+}
+
+
+def _bullet_list(items: List[str]) -> str:
+    """Markdown bullet lines for the final plan."""
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _context_snippet(codebase_context: List[str]) -> str:
+    """The first RAG documents, each capped, for the proposal/review prompts."""
+    return "\n".join(doc[:_PROMPT_CONTEXT_DOC_CHARS] for doc in codebase_context[:_PROMPT_CONTEXT_DOCS])
+
+
+def _log_step_start(step: _LLMStep, state: "PlanningState") -> None:
+    """Log that an LLM step is starting for the state's request."""
+    logger.info("[Planning] %s: %s...", step.progress, state["request"][:100])
+
+
+def _step_failed(step: _LLMStep, error: Exception) -> str:
+    """Log a failed LLM call and return the step's fallback output."""
+    logger.error("LLM call failed: %s", error)
+    return step.fallback
+
+
+def _step_changes(step: _LLMStep, output: str) -> dict:
+    """State changes of a finished LLM step: its output field plus the transcript message."""
+    return {
+        step.field: output,
+        "messages": [f"{step.heading}\n{output}"]
+    }
+
+
+def _with_retrieval(changes: dict, context_results: List[str], identified_files: Set[str]) -> dict:
+    """Add the codebase retrieval results to the analysis step's state changes."""
+    return {
+        "codebase_context": context_results,
+        "identified_files": sorted(identified_files),
+        **changes
+    }
+
+
+class PlanningState(TypedDict):
+    """State schema for planning workflow."""
+    # Input
+    request: str                           # Human's original request
+    session_id: str                        # Session ID for database
+    language: str                          # Detected language
+
+    # RAG context
+    codebase_context: Annotated[List[str], add]  # RAG query results
+    identified_files: List[str]            # Files relevant to the request (sorted, unique)
+
+    # Agent proposals
+    agent_a_analysis: str                  # Agent A's codebase analysis
+    agent_a_proposal: str                  # Agent A's concrete proposal
+    agent_b_review: str                    # Agent B's review and refinements
+
+    # Validation
+    validation_passed: bool                # Did proposal pass validation?
+    validation_issues: List[str]           # Issues found during validation
+
+    # Final output
+    final_plan: str                        # Merged final plan
+    messages: Annotated[List[str], add]    # Messages to display to user
+
+
+class PlanningNodes:
+    """
+    Node implementations for planning workflow.
+
+    Each node returns only the state fields it sets; the workflow merges them.
+    """
+
+    def __init__(
+        self,
+        rag_chain,
+        llm_caller_a,
+        llm_caller_b,
+        async_llm_caller_a: Optional[Callable[[str, str], Awaitable[str]]] = None,
+        async_llm_caller_b: Optional[Callable[[str, str], Awaitable[str]]] = None
+    ):
+        """
+        Initialize planning nodes.
+
+        Args:
+            rag_chain: RAG chain for querying codebase
+            llm_caller_a: Function to call LLM for Agent A (system_prompt, user_prompt) -> str
+            llm_caller_b: Function to call LLM for Agent B (system_prompt, user_prompt) -> str
+            async_llm_caller_a: Coroutine function used by the *_async nodes for Agent A
+                (defaults to running llm_caller_a in a worker thread)
+            async_llm_caller_b: Coroutine function used by the *_async nodes for Agent B
+                (defaults to running llm_caller_b in a worker thread)
+        """
+        self.rag_chain = rag_chain
+        self.llm_caller_a = llm_caller_a
+        self.llm_caller_b = llm_caller_b
+        self.async_llm_caller_a = async_llm_caller_a or partial(asyncio.to_thread, llm_caller_a)
+        self.async_llm_caller_b = async_llm_caller_b or partial(asyncio.to_thread, llm_caller_b)
+
+        # (stored_at, context_results, identified_files) keyed by normalized request hash;
+        # dropped when rag_chain is replaced
+        self._retrieval_cache: "OrderedDict[bytes, Tuple[float, Tuple[str, ...], frozenset]]" = OrderedDict()
+        self._retrieval_cache_chain = None
+
+    def analyze_codebase(self, state: PlanningState) -> dict:
+        """
+        Node 1: Analyze codebase using RAG.
+        MUST query RAG before any proposal can be made.
+        """
+        _log_step_start(_ANALYSIS_STEP, state)
+
+        context_results, identified_files = self._retrieve_codebase_context(state["request"])
+        changes = self._run_llm_step(
+            _ANALYSIS_STEP, self.llm_caller_a, self._analysis_prompts(state, context_results)
+        )
+        return _with_retrieval(changes, context_results, identified_files)
+
+    async def analyze_codebase_async(self, state: PlanningState) -> dict:
+        """Async counterpart of analyze_codebase (RAG retrieval runs in a worker thread)."""
+        _log_step_start(_ANALYSIS_STEP, state)
+
+        context_results, identified_files = await asyncio.to_thread(
+            self._retrieve_codebase_context, state["request"]
+        )
+        changes = await self._run_llm_step_async(
+            _ANALYSIS_STEP, self.async_llm_caller_a, self._analysis_prompts(state, context_results)
+        )
+        return _with_retrieval(changes, context_results, identified_files)
+
+    @staticmethod
+    def _run_llm_step(step: _LLMStep, llm_caller, prompts: Tuple[str, str]) -> dict:
+        """Call the LLM for a step and return the step's state changes (fallback text on failure)."""
+        try:
+            output = llm_caller(*prompts)
+        except Exception as e:
+            output = _step_failed(step, e)
+        return _step_changes(step, output)
+
+    @staticmethod
+    async def _run_llm_step_async(step: _LLMStep, async_llm_caller, prompts: Tuple[str, str]) -> dict:
+        """Async counterpart of _run_llm_step."""
+        try:
+            output = await async_llm_caller(*prompts)
+        except Exception as e:
+            output = _step_failed(step, e)
+        return _step_changes(step, output)
+
+    def _retrieve_codebase_context(self, request: str) -> Tuple[List[str], Set[str]]:
+        """
+        Query RAG for the request.
+
+        Results are cached per normalized request, so planning the same request
+        again (e.g. after a restart) skips the embedding + vector search.
+
+        Returns:
+            Tuple of (formatted documents, file paths found in them)
+        """
+        if not self.rag_chain:
+            return [], set()
+
+        # Codebase was reloaded - cached results belong to the old index
+        if self._retrieval_cache_chain is not self.rag_chain:
+            self._retrieval_cache.clear()
+            self._retrieval_cache_chain = self.rag_chain
+
+        key = hashlib.blake2b(" ".join(request.lower().split()).encode("utf-8"), digest_size=16).digest()
+        entry = self._retrieval_cache.get(key)
+        if entry is not None:
+            stored_at, cached_context, cached_files = entry
+            if time.monotonic() - stored_at <= RETRIEVAL_CACHE_TTL_SECONDS:
+                self._retrieval_cache.move_to_end(key)
+                logger.info("[Planning] RAG cache hit")
+                return list(cached_context), set(cached_files)
+            del self._retrieval_cache[key]
+
+        # One targeted query per aspect, sent to the retriever as one batch
+        queries = [template.format(request=request) for template in _RAG_QUERY_TEMPLATES]
+
+        context_results = []
+        identified_files = set()
+
+        try:
+            # Use retriever to get documents directly (no LLM call)
+            # Try batch() first (LangChain new API), fallback to get_relevant_documents() (old API)
+            try:
+                results = self.rag_chain.batch(queries)
+            except AttributeError:
+                results = [self.rag_chain.get_relevant_documents(query) for query in queries]
+
+            # Interleave the aspects by rank, dropping documents found by several
+            # queries and chunks of the same file that start the same way
+            docs = []
+            seen_keys = set()
+            for rank_docs in zip_longest(*results):
+                for doc in rank_docs:
+                    if doc is None:
+                        continue
+                    doc_key = (
+                        doc.metadata.get("source"),
+                        hashlib.blake2b(
+                            doc.page_content[:_RAG_DEDUP_PREFIX_CHARS].encode("utf-8"), digest_size=8
+                        ).digest()
+                    )
+                    if doc_key not in seen_keys:
+                        seen_keys.add(doc_key)
+                        docs.append(doc)
+            docs = docs[:_RAG_MAX_DOCS]
+
+            # Format documents into readable context
+            for i, doc in enumerate(docs, 1):
+                answer = f"[Document {i}]\n{doc.page_content}\n"
+                context_results.append(answer)
+                # Extract file paths from RAG results
+                identified_files.update(_PATH_RE.findall(doc.page_content))
+        except Exception as e:
+            logger.warning("RAG query failed: %s", e)
+            return context_results, identified_files
+
+        self._retrieval_cache[key] = (time.monotonic(), tuple(context_results), frozenset(identified_files))
+        if len(self._retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+            self._retrieval_cache.popitem(last=False)
+        return context_results, identified_files
+
+    def _analysis_prompts(self, state: PlanningState, context_results: List[str]) -> Tuple[str, str]:
+        """Build Agent A's (system_prompt, user_prompt) for the codebase analysis."""
+        language = state.get("language", "english")
+
+        user_prompt = localized(_ANALYSIS_USER_TEMPLATES, language).format(
+            request=state["request"],
+            context="\n".join(context_results) if context_results else localized(_NO_ANALYSIS_CONTEXT, language)
+        )
+        return localized(_ANALYSIS_SYSTEM_PROMPTS, language), user_prompt
+
+    def propose_changes(self, state: PlanningState) -> dict:
+        """
+        Node 2: Agent A proposes concrete changes.
+        MUST reference actual files from analysis step.
+        """
+        _log_step_start(_PROPOSAL_STEP, state)
+        return self._run_llm_step(_PROPOSAL_STEP, self.llm_caller_a, self._proposal_prompts(state))
+
+    async def propose_changes_async(self, state: PlanningState) -> dict:
+        """Async counterpart of propose_changes."""
+        _log_step_start(_PROPOSAL_STEP, state)
+        return await self._run_llm_step_async(_PROPOSAL_STEP, self.async_llm_caller_a, self._proposal_prompts(state))
+
+    def _proposal_prompts(self, state: PlanningState) -> Tuple[str, str]:
+        """Build Agent A's (system_prompt, user_prompt) for the change proposal."""
+        identified_files = state.get("identified_files", [])
+        codebase_context = state.get("codebase_context", [])
+        language = state.get("language", "english")
+
+        user_prompt = localized(_PROPOSAL_USER_TEMPLATES, language).format(
+            request=state["request"],
+            analysis=state.get("agent_a_analysis", ""),
+            files=', '.join(identified_files) if identified_files else localized(_PROPOSAL_NO_FILES, language),
+            context=_context_snippet(codebase_context) if codebase_context else localized(_NO_CONTEXT, language)
+        )
+        return localized(_PROPOSAL_SYSTEM_PROMPTS, language), user_prompt
+
+    def review_and_refine(self, state: PlanningState) -> dict:
+        """
+        Node 3: Agent B reviews and refines the proposal.
+        Focus on feasibility and missing details.
+        """
+        _log_step_start(_REVIEW_STEP, state)
+        return self._run_llm_step(_REVIEW_STEP, self.llm_caller_b, self._review_prompts(state))
+
+    async def review_and_refine_async(self, state: PlanningState) -> dict:
+        """Async counterpart of review_and_refine."""
+        _log_step_start(_REVIEW_STEP, state)
+        return await self._run_llm_step_async(_REVIEW_STEP, self.async_llm_caller_b, self._review_prompts(state))
+
+    def _review_prompts(self, state: PlanningState) -> Tuple[str, str]:
+        """Build Agent B's (system_prompt, user_prompt) for the proposal review."""
+        identified_files = state.get("identified_files", [])
+        codebase_context = state.get("codebase_context", [])
+        language = state.get("language", "english")
+
+        user_prompt = localized(_REVIEW_USER_TEMPLATES, language).format(
+            request=state["request"],
+            proposal=state.get("agent_a_proposal", ""),
+            files=', '.join(identified_files) if identified_files else localized(_REVIEW_NO_FILES, language),
+            context=_context_snippet(codebase_context) if codebase_context else localized(_NO_CONTEXT, language)
+        )
+        return localized(_REVIEW_SYSTEM_PROMPTS, language), user_prompt
+
+    def validate_proposal(self, state: PlanningState) -> dict:
+        """
+        Node 4: Validate that the proposal is concrete and realistic.
+        Reject proposals that are too abstract.
+        """
+        proposal = state.get("agent_a_proposal", "")
+        review = state.get("agent_b_review", "")
+        identified_files = state.get("identified_files", [])
+
+        logger.info("[Planning] Validating proposal...")
+
+        issues = []
+
+        # Check 1: Does proposal reference actual files?
+        if not identified_files:
+            issues.append("Không có file cụ thể nào được xác định từ codebase")
+
+        # Check 2: Does proposal have concrete steps?
+        found_keywords = {match.lower() for match in _ABSTRACT_RE.findall(proposal)}
+        for keyword in _ABSTRACT_KEYWORDS:
+            if keyword in found_keywords:
+                issues.append(f"Đề xuất chứa từ chung chung: '{keyword}'")
+
+        # Check 3: Does it have file paths?
+        if not _FILE_HINT_RE.search(proposal):
+            issues.append("Đề xuất không chỉ rõ đường dẫn file cụ thể")
+
+        validation_passed = len(issues) == 0
+
+        return {
+            "validation_passed": validation_passed,
+            "validation_issues": issues
+        }
+
+    def finalize_plan(self, state: PlanningState) -> dict:
+        """
+        Node 5: Merge proposals into final plan.
+        """
+        identified_files = state.get("identified_files", [])
+        language = state.get("language", "english")
+
+        logger.info("[Planning] Finalizing plan...")
+
+        if state.get("validation_passed", True):
+            template, no_files = _FINAL_PLAN_TEMPLATES, _FINAL_PLAN_NO_FILES
+        else:
+            template, no_files = _PLAN_ADJUSTMENT_TEMPLATES, _PLAN_ADJUSTMENT_NO_FILES
+
+        final_plan = localized(template, language).format(
+            request=state["request"],
+            proposal=state.get("agent_a_proposal", ""),
+            review=state.get("agent_b_review", ""),
+            issues=_bullet_list(state.get("validation_issues", [])),
+            files=_bullet_list(identified_files) if identified_files else localized(no_files, language)
+        )
 
         return {
-            **state,
             "final_plan": final_plan,
             "messages": [f"[Kế hoạch cuối cùng]\n{final_plan}"]
         }
@@ -11,12 +11,39 @@ This module provides intelligent analysis of the codebase:
 
 import re
 import json
-from typing import List, Dict, Optional, Set, Any
+import hashlib
+import heapq
+from operator import itemgetter
+from typing import List, Dict, Optional, Set, Tuple
 from dataclasses import dataclass
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, OrderedDict
 
 
-@dataclass
+# Maximum number of analyzed structures / task contexts kept per instance
+STRUCTURE_CACHE_SIZE = 128
+CONTEXT_CACHE_SIZE = 128
+
+# Word tokens: a library name made of word characters occurs as a whole word
+# exactly where one of these tokens equals it
+_WORD_TOKEN_RE = re.compile(r'\w+')
+
+# File paths mentioned in RAG text
+_FILE_PATH_RE = re.compile(r'([a-zA-Z0-9_/\-]+\.[a-zA-Z]+)')
+
+# Related files returned per task, and characters of context kept around each mention
+_MAX_RELATED_FILES = 10
+_RELATED_FILE_CONTEXT_CHARS = 100
+
+
+def _remember(cache: OrderedDict, key, value, maxsize: int) -> None:
+    """Store value in an LRU cache, evicting the least recently used entry when full."""
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
+@dataclass(slots=True, frozen=True)
 class TechStack:
     """Detected technology stack"""
     languages: List[str]
@@ -33,7 +60,7 @@ class TechStack:
 )"""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CodebaseStructure:
     """Analyzed codebase structure"""
     tech_stack: TechStack
@@ -52,10 +79,18 @@ class CodebaseStructure:
 )"""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class RelatedFile:
+    """A file mentioned in the RAG results for a task"""
+    path: str
+    context: str  # Text around the first mention
+    relevance_score: float
+
+
+@dataclass(slots=True, frozen=True)
 class RelevantContext:
     """Relevant context for a specific task"""
-    related_files: List[Dict[str, Any]]  # file path + content + relevance score
+    related_files: List[RelatedFile]
     similar_patterns: List[str]  # Similar code patterns found
     dependencies_to_consider: List[str]
     suggested_approach: str
@@ -105,6 +140,19 @@ class CodebaseIntelligence:
         }
     }
 
+    # TECH_PATTERNS compiled once (kept as separate regexes: each keeps its fast
+    # literal-prefix scan, which a joined alternation loses). Matching is
+    # case-insensitive by lowercasing the text once and the patterns here
+    # (none uses an uppercase escape such as \W), which is much faster than
+    # re.IGNORECASE
+    _TECH_REGEXES = {
+        category: {
+            tech_name: [re.compile(pattern.lower(), re.MULTILINE) for pattern in patterns]
+            for tech_name, patterns in techs.items()
+        }
+        for category, techs in TECH_PATTERNS.items()
+    }
+
     # Architectural patterns
     ARCHITECTURE_PATTERNS = {
         'mvc': ['models/', 'views/', 'controllers/'],
@@ -123,7 +171,12 @@ class CodebaseIntelligence:
             rag_chain: Optional RAG chain for querying codebase
         """
         self.rag_chain = rag_chain
-        self._structure_cache: Optional[CodebaseStructure] = None
+
+        # Structures keyed by a hash of the analyzed text (None = general structure
+        # queried from RAG) and contexts keyed by task; dropped when rag_chain is replaced
+        self._structure_cache: "OrderedDict[Optional[bytes], CodebaseStructure]" = OrderedDict()
+        self._context_cache: "OrderedDict[Tuple[str, str], RelevantContext]" = OrderedDict()
+        self._cache_chain = rag_chain
 
     def analyze_codebase(self, rag_results: str = None) -> CodebaseStructure:
         """
@@ -135,8 +188,14 @@ class CodebaseIntelligence:
         Returns:
             CodebaseStructure with detected information
         """
-        if self._structure_cache:
-            return self._structure_cache
+        self._drop_stale_caches()
+        key = None if rag_results is None else hashlib.blake2b(
+            rag_results.encode("utf-8"), digest_size=16
+        ).digest()
+        cached = self._structure_cache.get(key)
+        if cached is not None:
+            self._structure_cache.move_to_end(key)
+            return cached
 
         # If no RAG results provided, query for general structure
         if rag_results is None and self.rag_chain:
@@ -181,7 +240,7 @@ class CodebaseIntelligence:
         )
 
         # Cache the result
-        self._structure_cache = structure
+        _remember(self._structure_cache, key, structure, STRUCTURE_CACHE_SIZE)
 
         return structure
 
@@ -196,8 +255,16 @@ class CodebaseIntelligence:
         Returns:
             RelevantContext with task-specific information
         """
+        self._drop_stale_caches()
+        key = (task_description, task_type)
+        cached = self._context_cache.get(key)
+        if cached is not None:
+            self._context_cache.move_to_end(key)
+            return cached
+
         # Query RAG for relevant files
         rag_results = ""
+        rag_failed = False
         if self.rag_chain:
             try:
                 # Use retriever to get documents directly (no LLM call)
@@ -214,6 +281,7 @@ class CodebaseIntelligence:
                 rag_results = "\n\n".join(context_parts) if context_parts else ""
             except Exception as e:
                 print(f"RAG query error: {e}")
+                rag_failed = True
 
         # Parse RAG results to extract files
         related_files = self._parse_related_files(rag_results)
@@ -233,13 +301,23 @@ class CodebaseIntelligence:
         # Build tech stack context
         tech_context = self._build_tech_stack_context(structure.tech_stack)
 
-        return RelevantContext(
+        context = RelevantContext(
             related_files=related_files,
             similar_patterns=similar_patterns,
             dependencies_to_consider=dependencies,
             suggested_approach=suggested_approach,
             tech_stack_context=tech_context
         )
+        if not rag_failed:
+            _remember(self._context_cache, key, context, CONTEXT_CACHE_SIZE)
+        return context
+
+    def _drop_stale_caches(self) -> None:
+        """Codebase was reloaded - cached results belong to the old index."""
+        if self._cache_chain is not self.rag_chain:
+            self._structure_cache.clear()
+            self._context_cache.clear()
+            self._cache_chain = self.rag_chain
 
     def _query_rag_for_structure(self) -> str:
         """Query RAG for general codebase structure"""
@@ -276,12 +354,11 @@ class CodebaseIntelligence:
             'libraries': set(),
         }
 
-        for category, techs in self.TECH_PATTERNS.items():
-            for tech_name, patterns in techs.items():
-                for pattern in patterns:
-                    if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                        detected[category].add(tech_name)
-                        break
+        text_lower = text.lower()
+        for category, tech_regexes in self._TECH_REGEXES.items():
+            for tech_name, regexes in tech_regexes.items():
+                if any(regex.search(text_lower) for regex in regexes):
+                    detected[category].add(tech_name)
 
         # Extract libraries from imports
         libraries = self._extract_libraries(text)
@@ -325,7 +402,7 @@ class CodebaseIntelligence:
         patterns = defaultdict(list)
 
         # Find file paths
-        file_paths = re.findall(r'([a-zA-Z0-9_/\-]+\.[a-zA-Z]+)', text)
+        file_paths = _FILE_PATH_RE.findall(text)
 
         for path in file_paths:
             ext = path.split('.')[-1]
@@ -361,14 +438,18 @@ class CodebaseIntelligence:
         """Analyze library usage frequency"""
         libraries = self._extract_libraries(text)
 
-        # Count occurrences
+        # Count occurrences: one tokenization pass for plain names, a regex
+        # only for names with other characters (e.g. "react-dom", "@scope/pkg")
+        token_counts = Counter(_WORD_TOKEN_RE.findall(text))
         dependency_count = {}
         for lib in libraries:
-            count = len(re.findall(rf'\b{re.escape(lib)}\b', text))
-            dependency_count[lib] = count
+            if _WORD_TOKEN_RE.fullmatch(lib):
+                dependency_count[lib] = token_counts[lib]
+            else:
+                dependency_count[lib] = len(re.findall(rf'\b{re.escape(lib)}\b', text))
 
         # Return top dependencies
-        return dict(sorted(dependency_count.items(), key=lambda x: x[1], reverse=True)[:20])
+        return dict(heapq.nlargest(20, dependency_count.items(), key=itemgetter(1)))
 
     def _detect_patterns(self, text: str, file_patterns: Dict[str, List[str]]) -> List[str]:
         """Detect architectural patterns"""
@@ -388,31 +469,30 @@ class CodebaseIntelligence:
 
         return detected_patterns
 
-    def _parse_related_files(self, rag_results: str) -> List[Dict[str, Any]]:
+    def _parse_related_files(self, rag_results: str) -> List[RelatedFile]:
         """Parse related files from RAG results"""
         files = []
 
-        # Extract file mentions with context
-        file_pattern = r'([a-zA-Z0-9_/\-]+\.[a-zA-Z]+)'
-        matches = re.finditer(file_pattern, rag_results)
-
+        # Extract file mentions with context, stopping at the first distinct files
         seen = set()
-        for match in matches:
+        for match in _FILE_PATH_RE.finditer(rag_results):
             file_path = match.group(1)
-            if file_path not in seen:
-                # Get surrounding context
-                start = max(0, match.start() - 100)
-                end = min(len(rag_results), match.end() + 100)
-                context = rag_results[start:end]
-
-                files.append({
-                    'path': file_path,
-                    'context': context,
-                    'relevance_score': 0.8  # Could be enhanced with actual scoring
-                })
-                seen.add(file_path)
-
-        return files[:10]  # Top 10 most relevant
+            if file_path in seen:
+                continue
+            seen.add(file_path)
+
+            # Get surrounding context
+            start = max(0, match.start() - _RELATED_FILE_CONTEXT_CHARS)
+            end = match.end() + _RELATED_FILE_CONTEXT_CHARS
+            files.append(RelatedFile(
+                path=file_path,
+                context=rag_results[start:end],
+                relevance_score=0.8  # Could be enhanced with actual scoring
+            ))
+            if len(files) == _MAX_RELATED_FILES:
+                break
+
+        return files
 
     def _find_similar_patterns(self, task: str, rag_results: str) -> List[str]:
         """Find similar code patterns in the codebase"""
@@ -464,7 +544,7 @@ class CodebaseIntelligence:
         task: str,
         task_type: str,
         structure: CodebaseStructure,
-        related_files: List[Dict[str, Any]]
+        related_files: List[RelatedFile]
     ) -> str:
         """Generate a suggested approach based on codebase analysis"""
         suggestions = []
@@ -485,7 +565,7 @@ class CodebaseIntelligence:
 
         # Based on related files
         if related_files:
-            file_dirs = [f['path'].split('/')[0] for f in related_files if '/' in f['path']]
+            file_dirs = [f.path.split('/')[0] for f in related_files if '/' in f.path]
             if file_dirs:
                 most_common_dir = Counter(file_dirs).most_common(1)[0][0]
                 suggestions.append(f"Place new code in or near '{most_common_dir}/' directory")
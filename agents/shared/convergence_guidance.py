@@ -3,10 +3,17 @@ Convergence guidance service for AI agents.
 Provides dynamic prompts based on conversation state.
 """
 
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Optional
 from core.message import Role
 
 
+# Exchange counts at which the debate moves to the next stage
+# (initial -> debate -> convergence -> conclusion)
+_STAGE_THRESHOLDS = (2, 4, 6)
+
+
 class ConvergenceGuidanceService:
     """Service to generate convergence guidance based on conversation state."""
     
@@ -217,8 +224,14 @@ Recommendation: [...]"""
 - ⚠️ This is YOUR position - be CONFIDENT and FIRM with it!"""
     
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_summarize_other_context(agent_role: Role, language: str) -> str:
-        """Get context when human asks agent to summarize the other agent's proposal."""
+        """
+        Get context when human asks agent to summarize the other agent's proposal.
+        
+        Formatted once per (role, language) and cached; every other guidance
+        block is a constant string.
+        """
         other_agent_name = "Agent A" if agent_role == Role.AGENT_B else "Agent B"
         
         if language == 'vietnamese':
@@ -304,6 +317,14 @@ Required format:
             else:
                 return "\n\n💬 Note: Human is addressing the OTHER agent, not you. Listen and prepare to respond when it's your turn."
     
+    # Guidance getters indexed by debate stage (see _STAGE_THRESHOLDS)
+    _STAGE_GUIDANCE = (
+        get_initial_guidance,
+        get_debate_guidance,
+        get_convergence_guidance,
+        get_conclusion_guidance,
+    )
+    
     @classmethod
     def build_convergence_guidance(
         cls,
@@ -327,14 +348,8 @@ Required format:
             return cls.get_stop_guidance(language)
         
         # Based on exchange count
-        if exchange_count >= 6:
-            return cls.get_conclusion_guidance(language)
-        elif exchange_count >= 4:
-            return cls.get_convergence_guidance(language)
-        elif exchange_count >= 2:
-            return cls.get_debate_guidance(language)
-        else:
-            return cls.get_initial_guidance(language)
+        stage = bisect_right(_STAGE_THRESHOLDS, exchange_count)
+        return cls._STAGE_GUIDANCE[stage](language)
     
     @classmethod
     def build_addressing_context(
@@ -3,10 +3,30 @@ Conversation analysis service for AI agents.
 Analyzes conversation history and provides insights.
 """
 
+import re
 from typing import List, Tuple
 from core.message import Message, Role
 
 
+def _keyword_re(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile keywords into one alternation regex (a single scan finds any of them)."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+AGENT_ROLES = frozenset((Role.AGENT_A, Role.AGENT_B))
+
+# Keyword matchers for human messages (searched in the lowercased content)
+_STOP_RE = _keyword_re((
+    'stop', 'dừng', 'thôi', 'đủ rồi', 'kết thúc',
+    'summarize', 'tóm tắt', 'tổng kết', '🛑'
+))
+_ADDRESS_RES = {
+    Role.AGENT_A: _keyword_re(('agent a', 'agenta', '@a', 'a,', 'a:', 'bạn a', 'a ơi', 'theo a')),
+    Role.AGENT_B: _keyword_re(('agent b', 'agentb', '@b', 'b,', 'b:', 'bạn b', 'b ơi', 'theo b')),
+}
+_SUMMARIZE_RE = _keyword_re(('tóm tắt', 'summarize', 'tổng kết', 'cho tôi kết quả', 'kết quả cuối cùng'))
+
+
 class ConversationAnalyzer:
     """Analyzes conversation history to extract useful information."""
     
@@ -21,8 +41,7 @@ class ConversationAnalyzer:
         Returns:
             Number of exchange pairs
         """
-        agent_messages = [m for m in messages if m.role in [Role.AGENT_A, Role.AGENT_B]]
-        return len(agent_messages) // 2
+        return sum(1 for m in messages if m.role in AGENT_ROLES) // 2
     
     @staticmethod
     def count_exchanges_since_human(messages: List[Message]) -> int:
@@ -35,16 +54,42 @@ class ConversationAnalyzer:
         Returns:
             Number of exchanges since last human message
         """
-        human_messages = [m for m in messages if m.role == Role.HUMAN]
-        if not human_messages:
-            return 0
+        # Walk back from the end, counting agent messages until the last human one
+        agent_messages_since = 0
+        for m in reversed(messages):
+            if m.role is Role.HUMAN:
+                return agent_messages_since // 2
+            if m.role in AGENT_ROLES:
+                agent_messages_since += 1
+        
+        # No human message at all
+        return 0
+    
+    @staticmethod
+    def count_exchanges(messages: List[Message]) -> Tuple[int, int]:
+        """
+        Count agent exchanges overall and since the last human input in one pass.
+        
+        Args:
+            messages: List of messages
+            
+        Returns:
+            Tuple of (count_agent_exchanges, count_exchanges_since_human)
+        """
+        agent_messages = 0
+        agent_messages_since_human = 0
+        seen_human = False
+        for m in messages:
+            if m.role in AGENT_ROLES:
+                agent_messages += 1
+                agent_messages_since_human += 1
+            elif m.role is Role.HUMAN:
+                seen_human = True
+                agent_messages_since_human = 0
         
-        last_human_index = len(messages) - 1 - messages[::-1].index(human_messages[-1])
-        agent_messages_since = [
-            m for m in messages[last_human_index:] 
-            if m.role in [Role.AGENT_A, Role.AGENT_B]
-        ]
-        return len(agent_messages_since) // 2
+        if not seen_human:
+            agent_messages_since_human = 0
+        return agent_messages // 2, agent_messages_since_human // 2
     
     @staticmethod
     def detect_human_intervention(
@@ -61,33 +106,28 @@ class ConversationAnalyzer:
         Returns:
             Tuple of (wants_stop, addressing_me, addressing_other, asks_to_summarize_other)
         """
-        if message.role != Role.HUMAN:
+        if message.role is not Role.HUMAN:
             return False, False, False, False
         
-        content_lower = message.content.lower()
+        content_lower = message.content_lower
         
         # Check if human wants to stop
-        stop_keywords = [
-            'stop', 'dừng lại', 'thôi', 'đủ rồi', 'kết thúc', 
-            'summarize', 'tóm tắt', 'tổng kết', '🛑'
-        ]
-        wants_stop = any(keyword in content_lower for keyword in stop_keywords)
+        wants_stop = _STOP_RE.search(content_lower) is not None
         
         # Check who human is addressing
         if agent_role == Role.AGENT_A:
-            my_keywords = ['agent a', 'agenta', '@a', 'a,', 'a:', 'bạn a', 'a ơi', 'theo a']
-            other_keywords = ['agent b', 'agentb', '@b', 'b,', 'b:', 'bạn b', 'b ơi', 'theo b']
+            my_re, other_re = _ADDRESS_RES[Role.AGENT_A], _ADDRESS_RES[Role.AGENT_B]
         else:  # AGENT_B
-            my_keywords = ['agent b', 'agentb', '@b', 'b,', 'b:', 'bạn b', 'b ơi', 'theo b']
-            other_keywords = ['agent a', 'agenta', '@a', 'a,', 'a:', 'bạn a', 'a ơi', 'theo a']
+            my_re, other_re = _ADDRESS_RES[Role.AGENT_B], _ADDRESS_RES[Role.AGENT_A]
         
-        addressing_me = any(keyword in content_lower for keyword in my_keywords)
-        addressing_other = any(keyword in content_lower for keyword in other_keywords)
+        addressing_me = my_re.search(content_lower) is not None
+        addressing_other = other_re.search(content_lower) is not None
         
         # Check if human asks to summarize the other agent
-        summarize_keywords = ['tóm tắt', 'summarize', 'tổng kết', 'cho tôi kết quả', 'kết quả cuối cùng']
-        has_summarize_request = any(keyword in content_lower for keyword in summarize_keywords)
-        asks_to_summarize_other = addressing_me and addressing_other and has_summarize_request
+        asks_to_summarize_other = (
+            addressing_me and addressing_other
+            and _SUMMARIZE_RE.search(content_lower) is not None
+        )
         
         return wants_stop, addressing_me, addressing_other, asks_to_summarize_other
     
@@ -103,7 +143,7 @@ class ConversationAnalyzer:
             The topic string, or empty string if not found
         """
         for msg in messages:
-            if msg.role == Role.HUMAN and "Let's discuss:" in msg.content:
+            if msg.role is Role.HUMAN and "Let's discuss:" in msg.content:
                 return msg.content.split("Let's discuss:", 1)[1].strip()
         return ""
 
@@ -10,9 +10,11 @@ class LanguageDetector:
     
     # Vietnamese-specific characters (comprehensive)
     VIETNAMESE_CHARS_PATTERN = r'[àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđÀÁẠẢÃÂẦẤẬẨẪĂẰẮẶẲẴÈÉẸẺẼÊỀẾỆỂỄÌÍỊỈĨÒÓỌỎÕÔỒỐỘỔỖƠỜỚỢỞỠÙÚỤỦŨƯỪỨỰỬỮỲÝỴỶỸĐ]'
+    _VIETNAMESE_CHARS_RE = re.compile(VIETNAMESE_CHARS_PATTERN)
+    _WORD_RE = re.compile(r'\b\w+\b')
     
     # Common Vietnamese words (comprehensive, case insensitive)
-    VIETNAMESE_WORDS = {
+    VIETNAMESE_WORDS = frozenset({
         # Common verbs
         'là', 'có', 'được', 'cho', 'đã', 'sẽ', 'làm', 'nói', 'đi', 'tới', 'về',
         'đến', 'ra', 'vào', 'lên', 'xuống', 'qua', 'thấy', 'biết', 'muốn', 'cần',
@@ -44,7 +46,10 @@ class LanguageDetector:
         # Common verbs (more)
         'xem', 'nghe', 'ăn', 'uống', 'mua', 'bán', 'dùng', 'dùng', 'học', 'dạy',
         'hiểu', 'nhớ', 'quên', 'thích', 'ghét', 'yêu', 'giúp', 'hỏi', 'trả', 'lời'
-    }
+    })
+    
+    # The only Vietnamese words that can appear in pure-ASCII text
+    _ASCII_VIETNAMESE_WORDS = frozenset(word for word in VIETNAMESE_WORDS if word.isascii())
     
     @classmethod
     def detect(cls, text: str) -> str:
@@ -57,22 +62,31 @@ class LanguageDetector:
         Returns:
             'vietnamese' or 'english'
         """
-        # Count Vietnamese characters
-        vietnamese_count = len(re.findall(cls.VIETNAMESE_CHARS_PATTERN, text))
-        
+        # Pure-ASCII text has no Vietnamese characters, so skip the regex scan
+        # and only look for unaccented Vietnamese words
+        if text.isascii():
+            vietnamese_words = cls._ASCII_VIETNAMESE_WORDS
         # If ANY Vietnamese characters found, it's Vietnamese
-        if vietnamese_count > 0:
+        elif cls._VIETNAMESE_CHARS_RE.search(text):
             return 'vietnamese'
+        else:
+            vietnamese_words = cls.VIETNAMESE_WORDS
         
         # Normalize and split text
         text_lower = text.lower()
-        words = re.findall(r'\b\w+\b', text_lower)
+        words = cls._WORD_RE.findall(text_lower)
         
         # Count Vietnamese words
-        vietnamese_word_count = sum(1 for word in words if word in cls.VIETNAMESE_WORDS)
-        
         # If more than 5% of words are Vietnamese OR at least 2 Vietnamese words found, assume Vietnamese
-        if len(words) > 0 and (vietnamese_word_count / len(words) > 0.05 or vietnamese_word_count >= 2):
+        vietnamese_word_count = 0
+        for word in words:
+            if word in vietnamese_words:
+                vietnamese_word_count += 1
+                if vietnamese_word_count >= 2:
+                    return 'vietnamese'
+        
+        # A single Vietnamese word is more than 5% of fewer than 20 words
+        if vietnamese_word_count == 1 and len(words) < 20:
             return 'vietnamese'
         
         return 'english'
@@ -3,6 +3,11 @@ Language-specific instructions for AI agents.
 """
 
 
+def localized(texts: dict, language: str) -> str:
+    """Pick the text for the session language from a {"vietnamese": ..., "english": ...} table."""
+    return texts["vietnamese"] if language == "vietnamese" else texts["english"]
+
+
 class LanguageInstructions:
     """Provides language-specific instructions for agents."""
     
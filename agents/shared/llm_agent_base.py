@@ -2,8 +2,13 @@
 Base class for LLM-powered agents with shared logic.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
 from abc import abstractmethod
 
 from agents.base_agent import BaseAgent
@@ -12,6 +17,8 @@ from agents.shared.language_detector import LanguageDetector
 from agents.shared.language_instructions import LanguageInstructions
 from agents.shared.convergence_guidance import ConvergenceGuidanceService
 from agents.shared.conversation_analyzer import ConversationAnalyzer
+from agents.shared.llm_cache import LLMResponseCache
+from agents.shared.llm_clients import close_async_openai_clients
 from core.message import Message, Role, Signal
 
 # Import new planning system components
@@ -22,6 +29,83 @@ from agents.shared.prompt_generator import PromptGenerator
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of sessions whose detected language is remembered
+SESSION_LANGUAGE_CACHE_SIZE = 1024
+
+# Language detected from each session's topic, shared by all agents so the
+# topic is located and analyzed once per session
+_session_languages: "OrderedDict[str, str]" = OrderedDict()
+
+# Phrases (matched against the lowercased response) that mark a strong
+# conclusion or agreement, in Vietnamese and English
+_CONCLUSION_PHRASES = (
+    # Vietnamese
+    "tóm lại", "kết luận", "thống nhất rồi", "quyết định là",
+    "vậy là xong", "oke như vậy", "ok đó là xong", "ổn rồi nhé",
+    "đã rõ ràng", "rõ ràng rồi nhé", "như vậy là tốt", "xong rồi",
+    "📌 tóm tắt", "📌 summary",
+    # English
+    "in conclusion", "to summarize", "in summary", "final thought",
+    "to conclude", "alright, that's it", "sounds perfect", "let's ship it",
+    "that's our decision", "we're done", "that's settled", "agreed on that",
+    "cool, we're aligned", "perfect, let's go",
+)
+_AGREEMENT_PHRASES = (
+    # Vietnamese
+    "hoàn toàn đồng ý", "chính xác luôn", "chuẩn không cần chỉnh",
+    "tốt lắm", "hay lắm", "ý hay đấy", "được luôn",
+    # English
+    "completely agree", "absolutely right", "spot on", "couldn't agree more",
+    "that's perfect", "love that approach",
+)
+
+# Requests for human input in a response
+_HUMAN_INPUT_PATTERN = "human|moderator"
+_HUMAN_INPUT_RE = re.compile(_HUMAN_INPUT_PATTERN, re.IGNORECASE)
+
+# All handover phrases in one case-insensitive alternation, so a single scan
+# finds the first one; the named group tells which kind it was
+_HANDOVER_PHRASE_RE = re.compile(
+    "(?P<conclusion>" + "|".join(map(re.escape, _CONCLUSION_PHRASES)) + ")"
+    "|(?P<agreement>" + "|".join(map(re.escape, _AGREEMENT_PHRASES)) + ")"
+    "|(?P<human_input>" + _HUMAN_INPUT_PATTERN + ")",
+    re.IGNORECASE
+)
+
+
+# Fallback responses returned when the LLM API call fails
+_ERROR_RESPONSE_VI = "⚠️ Xin lỗi, tôi gặp sự cố với {agent_type} API. Lỗi: {error}... \n\nVui lòng thử lại hoặc chuyển sang agent khác."
+_ERROR_RESPONSE_EN = "⚠️ I apologize, I'm having trouble with {agent_type} API. Error: {error}... \n\nPlease try again or switch to another agent."
+
+# Maximum number of characters of the error message shown in the fallback response
+_ERROR_SUMMARY_LENGTH = 100
+
+# Provider errors worth retrying (rate limits, timeouts, overloaded servers),
+# matched by class name so no provider SDK has to be imported here
+_TRANSIENT_ERROR_NAMES = frozenset((
+    "RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError",
+    "ResourceExhausted", "ServiceUnavailable", "DeadlineExceeded", "TooManyRequests",
+))
+_TRANSIENT_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+
+# Exponential backoff between retries (seconds): up to base * 2**attempt, capped, full jitter
+_RETRY_BASE_DELAY = 1.0
+_RETRY_MAX_DELAY = 30.0
+
+
+def _is_transient_llm_error(error: Exception) -> bool:
+    """Whether a failed LLM call is likely to succeed when retried."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    if type(error).__name__ in _TRANSIENT_ERROR_NAMES:
+        return True
+    return getattr(error, "status_code", None) in _TRANSIENT_STATUS_CODES
+
+
+def _retry_delay(attempt: int) -> float:
+    """Jittered exponential backoff delay before retry number attempt + 1."""
+    return random.uniform(0, min(_RETRY_MAX_DELAY, _RETRY_BASE_DELAY * 2 ** attempt))
+
 
 class LLMAgentBase(BaseAgent):
     """
@@ -30,8 +114,21 @@ class LLMAgentBase(BaseAgent):
     Subclasses only need to implement:
     - __init__: Initialize the specific LLM client
     - _call_llm: Make the actual API call to the LLM
+
+    Subclasses with a native async client may also override _call_llm_async
+    (the default runs _call_llm in a worker thread).
     """
 
+    __slots__ = (
+        "system_prompt",
+        "detected_language",
+        "codebase_intelligence",
+        "task_context",
+        "use_dynamic_prompts",
+        "response_cache",
+        "_dynamic_prompt_cache",
+    )
+
     def __init__(self, role: Role, db, config: dict = None):
         super().__init__(role, db, config)
 
@@ -45,15 +142,25 @@ class LLMAgentBase(BaseAgent):
         self.codebase_intelligence: Optional[CodebaseIntelligence] = None
         self.task_context: Optional[TaskContext] = None
         self.use_dynamic_prompts: bool = config.get('use_dynamic_prompts', True) if config else True
+
+        # Last dynamic system prompt with the (task_context, codebase_structure) it was built from
+        self._dynamic_prompt_cache: Optional[Tuple[TaskContext, Optional[CodebaseStructure], str]] = None
+
+        # Cache responses to identical prompts to skip repeated API round-trips
+        self.response_cache = LLMResponseCache(
+            maxsize=self.config.get('llm_cache_size', 512),
+            ttl_seconds=self.config.get('llm_cache_ttl', 3600)
+        )
         
     @abstractmethod
-    def _call_llm(self, system_prompt: str, user_prompt: str) -> str:
+    def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
         """
         Call the LLM API to generate a response.
         
         Args:
             system_prompt: The system prompt
             user_prompt: The user prompt
+            max_tokens: Output token cap (None = provider default)
             
         Returns:
             Generated response text
@@ -62,11 +169,303 @@ class LLMAgentBase(BaseAgent):
             Exception: If the API call fails
         """
         pass
-    
-    def generate_response(self, previous_message: Message, skip_rag: bool = False) -> str:
+
+    def _call_llm_cached(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call the LLM, returning a cached response when the same prompts and token cap were answered recently.
+
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = provider default)
+
+        Returns:
+            Generated (or cached) response text
+        """
+        cached = self.response_cache.get(system_prompt, user_prompt, max_tokens)
+        if cached is not None:
+            logger.info(
+                "%s: LLM response cache hit (%s hits / %s LLM calls)",
+                self.role.value, self.response_cache.hits, self.response_cache.misses
+            )
+            return cached
+
+        generated_text = self._call_llm_with_retry(system_prompt, user_prompt, max_tokens)
+        self.response_cache.put(system_prompt, user_prompt, generated_text, max_tokens)
+        return generated_text
+
+    def _call_llm_with_retry(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call the LLM, retrying transient failures (rate limits, timeouts, 5xx)
+        with jittered exponential backoff.
+
+        At most `llm_max_retries` (config, default 2) retries are made; other
+        errors are raised immediately.
+
+        Raises:
+            Exception: If the API call fails permanently or retries run out
+        """
+        max_retries = self.config.get('llm_max_retries', 2)
+        attempt = 0
+        while True:
+            try:
+                return self._call_llm(system_prompt, user_prompt, max_tokens)
+            except Exception as e:
+                if attempt >= max_retries or not _is_transient_llm_error(e):
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning("%s: transient LLM error (%s), retrying in %.1fs", self.role.value, e, delay)
+                time.sleep(delay)
+                attempt += 1
+
+    async def _call_llm_async(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> str:
+        """
+        Call the LLM API without blocking the event loop.
+
+        The default implementation runs the synchronous _call_llm in a worker
+        thread; subclasses with an async SDK client override this.
+
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = provider default)
+
+        Returns:
+            Generated response text
+
+        Raises:
+            Exception: If the API call fails
+        """
+        return await asyncio.to_thread(self._call_llm, system_prompt, user_prompt, max_tokens)
+
+    async def _call_llm_cached_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Async counterpart of _call_llm_cached."""
+        cached = self.response_cache.get(system_prompt, user_prompt, max_tokens)
+        if cached is not None:
+            logger.info(
+                "%s: LLM response cache hit (%s hits / %s LLM calls)",
+                self.role.value, self.response_cache.hits, self.response_cache.misses
+            )
+            return cached
+
+        generated_text = await self._call_llm_with_retry_async(system_prompt, user_prompt, max_tokens)
+        self.response_cache.put(system_prompt, user_prompt, generated_text, max_tokens)
+        return generated_text
+
+    async def _call_llm_with_retry_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Async counterpart of _call_llm_with_retry."""
+        max_retries = self.config.get('llm_max_retries', 2)
+        attempt = 0
+        while True:
+            try:
+                return await self._call_llm_async(system_prompt, user_prompt, max_tokens)
+            except Exception as e:
+                if attempt >= max_retries or not _is_transient_llm_error(e):
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning("%s: transient LLM error (%s), retrying in %.1fs", self.role.value, e, delay)
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def _call_llm_batch_async(
+        self,
+        prompts: List[Tuple[str, str]],
+        max_tokens: Optional[int] = None
+    ) -> List[str]:
+        """
+        Run several independent LLM calls concurrently.
+
+        At most `llm_max_concurrency` (config, default 4) requests are in
+        flight at once to stay within provider rate limits.
+
+        Args:
+            prompts: List of (system_prompt, user_prompt) pairs
+            max_tokens: Output token cap for every call (None = the regular
+                response cap, config `max_tokens`)
+
+        Returns:
+            Generated response texts, in the same order as prompts
+
+        Raises:
+            Exception: If any of the API calls fails
+        """
+        semaphore = asyncio.Semaphore(self.config.get('llm_max_concurrency', 4))
+        if max_tokens is None:
+            max_tokens = self._max_tokens_for(human_wants_stop=False, exchange_count=0)
+
+        async def call_one(system_prompt: str, user_prompt: str) -> str:
+            async with semaphore:
+                return await self._call_llm_cached_async(system_prompt, user_prompt, max_tokens)
+
+        return list(await asyncio.gather(
+            *(call_one(system_prompt, user_prompt) for system_prompt, user_prompt in prompts)
+        ))
+
+    def _call_llm_batch(self, prompts: List[Tuple[str, str]], max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Synchronous wrapper around _call_llm_batch_async.
+
+        Must not be called from inside a running event loop (await
+        _call_llm_batch_async there instead).
+        """
+        async def run_batch() -> List[str]:
+            # asyncio.run() starts a new loop per call; close the HTTP clients
+            # opened on it before the loop goes away
+            try:
+                return await self._call_llm_batch_async(prompts, max_tokens)
+            finally:
+                await close_async_openai_clients()
+
+        return asyncio.run(run_batch())
+
+    def _stream_llm(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Stream the LLM response as text chunks.
+
+        The default implementation yields the full _call_llm result as a single
+        chunk; subclasses whose SDK supports streaming override this.
+
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap (None = provider default)
+
+        Yields:
+            Response text chunks in order
+
+        Raises:
+            Exception: If the API call fails
+        """
+        yield self._call_llm(system_prompt, user_prompt, max_tokens)
+
+    def generate_response(
+        self,
+        previous_message: Message,
+        skip_rag: bool = False,
+        conversation_history: Optional[List[Message]] = None
+    ) -> str:
         """
         Generate response using the LLM model with dynamic planning prompts.
 
+        Args:
+            previous_message: The message to respond to
+            skip_rag: If True, skip RAG query (useful when RAG context already provided in Planning Mode)
+            conversation_history: Messages already fetched by the caller (fetched from the database when None)
+
+        Returns:
+            Generated response text
+        """
+        system_prompt, user_prompt, exchange_count, max_tokens = self._prepare_prompts(
+            previous_message, skip_rag, conversation_history
+        )
+
+        try:
+            # Call the LLM (implemented by subclass), reusing cached answers to identical prompts
+            generated_text = self._call_llm_cached(system_prompt, user_prompt, max_tokens)
+            self._log_generated(generated_text, exchange_count)
+            return generated_text
+        except Exception as e:
+            return self._llm_error_response(e)
+
+    def generate_response_stream(
+        self,
+        previous_message: Message,
+        skip_rag: bool = False,
+        conversation_history: Optional[List[Message]] = None
+    ) -> Iterator[str]:
+        """
+        Streaming counterpart of generate_response.
+
+        Yields text chunks as the provider emits them so callers can display the
+        response before it is complete. The joined text is stored in the
+        response cache only when the stream finishes without error.
+
+        Args:
+            previous_message: The message to respond to
+            skip_rag: If True, skip RAG query (useful when RAG context already provided in Planning Mode)
+            conversation_history: Messages already fetched by the caller (fetched from the database when None)
+
+        Yields:
+            Response text chunks (or the fallback error text if the call fails before any output)
+
+        Raises:
+            Exception: If the stream fails after some chunks were already yielded
+        """
+        system_prompt, user_prompt, exchange_count, max_tokens = self._prepare_prompts(
+            previous_message, skip_rag, conversation_history
+        )
+
+        cached = self.response_cache.get(system_prompt, user_prompt, max_tokens)
+        if cached is not None:
+            logger.info(
+                "%s: LLM response cache hit (%s hits / %s LLM calls)",
+                self.role.value, self.response_cache.hits, self.response_cache.misses
+            )
+            yield cached
+            return
+
+        chunks = []
+        try:
+            for chunk in self._stream_llm(system_prompt, user_prompt, max_tokens):
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+        except Exception as e:
+            if not chunks:
+                yield self._llm_error_response(e)
+                return
+            # Text was already emitted: re-raise so the caller can tell the reply
+            # was truncated (the partial text is kept out of the cache)
+            logger.error("%s: LLM stream interrupted: %s", self.role.value, e)
+            raise
+
+        generated_text = "".join(chunks).strip()
+        self.response_cache.put(system_prompt, user_prompt, generated_text, max_tokens)
+        self._log_generated(generated_text, exchange_count)
+
+    async def generate_response_async(
+        self,
+        previous_message: Message,
+        skip_rag: bool = False,
+        conversation_history: Optional[List[Message]] = None
+    ) -> str:
+        """
+        Async counterpart of generate_response.
+
+        Prompt building (database reads, RAG retrieval) runs in a worker thread,
+        and the LLM call is awaited so several agents or sessions can overlap
+        their network round-trips with asyncio.gather.
+        """
+        system_prompt, user_prompt, exchange_count, max_tokens = await asyncio.to_thread(
+            self._prepare_prompts, previous_message, skip_rag, conversation_history
+        )
+
+        try:
+            generated_text = await self._call_llm_cached_async(system_prompt, user_prompt, max_tokens)
+            self._log_generated(generated_text, exchange_count)
+            return generated_text
+        except Exception as e:
+            return self._llm_error_response(e)
+
+    def _prepare_prompts(
+        self,
+        previous_message: Message,
+        skip_rag: bool = False,
+        conversation_history: Optional[List[Message]] = None
+    ) -> Tuple[str, str, int, Optional[int]]:
+        """
+        Build the system and user prompts for the next response.
+
         This method contains all shared logic for:
         - Task analysis and classification
         - Codebase intelligence gathering
@@ -79,91 +478,100 @@ class LLMAgentBase(BaseAgent):
         Args:
             previous_message: The message to respond to
             skip_rag: If True, skip RAG query (useful when RAG context already provided in Planning Mode)
+            conversation_history: Messages already fetched by the caller (fetched from the database when None)
 
         Returns:
-            Generated response text
+            Tuple of (system_prompt, user_prompt, exchange_count, max_tokens)
+
+        Note:
+            The system prompt must stay identical across turns of a session so
+            providers can reuse their prefix cache for it: it may depend only on
+            the role, the task context and the (cached) codebase structure.
+            Anything that changes per message (history, RAG results, relevant
+            files, exchange count, guidance) belongs at the end of the user prompt.
         """
-        # Get the full conversation history
-        all_messages = self.db.get_messages(previous_message.session_id)
-
-        # Check if human is requesting STOP/summary
-        human_wants_stop = (
-            previous_message.role == Role.HUMAN and
-            any(keyword in previous_message.content.lower()
-                for keyword in ['stop', 'dừng', 'summarize', 'tóm tắt', '🛑'])
-        )
+        # Get the full conversation history (fetched once, reused for the context below)
+        if conversation_history is None:
+            conversation_history = self.db.get_messages(previous_message.session_id)
+        all_messages = conversation_history
+
+        # Detect human intervention (all flags are False unless the human just spoke):
+        # STOP/summary request and who is being addressed
+        human_just_intervened = previous_message.role is Role.HUMAN
+        (
+            human_wants_stop,
+            human_addressing_me,
+            human_addressing_other,
+            human_asks_to_summarize_other
+        ) = ConversationAnalyzer.detect_human_intervention(previous_message, self.role)
 
         # Determine how much context to load
         if human_wants_stop:
             # Get FULL conversation context for comprehensive summary
             context = self.get_conversation_context(
                 previous_message.session_id,
-                max_messages=None  # Get ALL messages
+                max_messages=None,  # Get ALL messages
+                messages=all_messages
             )
             logger.info(
-                f"{self.role.value}: Human requested STOP - using FULL conversation context "
-                f"({len(all_messages)} messages)"
+                "%s: Human requested STOP - using FULL conversation context (%s messages)",
+                self.role.value, len(all_messages)
             )
         else:
             # Get recent context (last 10 messages)
             context = self.get_conversation_context(
                 previous_message.session_id,
-                max_messages=10
+                max_messages=10,
+                messages=all_messages
             )
 
-        # Detect language from the first human message (the topic)
-        if self.detected_language is None:
+        # Detect language from the first human message (the topic), once per session
+        session_language = _session_languages.get(previous_message.session_id)
+        if session_language is None:
             topic = ConversationAnalyzer.extract_topic_from_messages(all_messages)
             if topic:
-                self.detected_language = LanguageDetector.detect(topic)
-                logger.info(f"{self.role.value}: Detected language = {self.detected_language}")
+                session_language = LanguageDetector.detect(topic)
+                _session_languages[previous_message.session_id] = session_language
+                if len(_session_languages) > SESSION_LANGUAGE_CACHE_SIZE:
+                    _session_languages.popitem(last=False)
+                logger.info("%s: Detected language = %s", self.role.value, session_language)
+        if session_language is not None:
+            self.detected_language = session_language
 
         # === NEW: Dynamic Planning System ===
         # Analyze task context on first human message
-        if self.task_context is None and previous_message.role == Role.HUMAN:
+        if self.task_context is None and previous_message.role is Role.HUMAN:
             try:
                 self.task_context = TaskAnalyzer.analyze(previous_message.content)
                 logger.info(
-                    f"{self.role.value}: Task analyzed - "
-                    f"Type: {self.task_context.task_type.value}, "
-                    f"Complexity: {self.task_context.complexity.value}"
+                    "%s: Task analyzed - Type: %s, Complexity: %s",
+                    self.role.value, self.task_context.task_type.value, self.task_context.complexity.value
                 )
             except Exception as e:
-                logger.warning(f"{self.role.value}: Task analysis failed: {e}")
+                logger.warning("%s: Task analysis failed: %s", self.role.value, e)
 
         # Initialize codebase intelligence if RAG is available
         if self.codebase_intelligence is None and self.rag_chain:
             try:
                 self.codebase_intelligence = CodebaseIntelligence(self.rag_chain)
-                logger.info(f"{self.role.value}: Codebase intelligence initialized")
+                logger.info("%s: Codebase intelligence initialized", self.role.value)
             except Exception as e:
-                logger.warning(f"{self.role.value}: Codebase intelligence init failed: {e}")
+                logger.warning("%s: Codebase intelligence init failed: %s", self.role.value, e)
         
         # Count agent exchanges
         exchange_count = ConversationAnalyzer.count_agent_exchanges(all_messages)
         
-        # Detect human intervention
-        human_just_intervened = previous_message.role == Role.HUMAN
-        (
-            human_wants_stop_flag,
-            human_addressing_me,
-            human_addressing_other,
-            human_asks_to_summarize_other
-        ) = ConversationAnalyzer.detect_human_intervention(previous_message, self.role)
-        
-        # Override human_wants_stop with the more detailed flag
+        # Log who the human is addressing
         if human_just_intervened:
-            human_wants_stop = human_wants_stop_flag
-            
             if human_asks_to_summarize_other:
                 other_agent_name = "Agent A" if self.role == Role.AGENT_B else "Agent B"
-                logger.info(f"{self.role.value}: Human asks ME to summarize what {other_agent_name} proposed")
+                logger.info("%s: Human asks ME to summarize what %s proposed", self.role.value, other_agent_name)
             elif human_addressing_me:
-                logger.info(f"{self.role.value}: Human is addressing ME specifically")
+                logger.info("%s: Human is addressing ME specifically", self.role.value)
             elif human_addressing_other:
-                logger.info(f"{self.role.value}: Human is addressing the OTHER agent")
+                logger.info("%s: Human is addressing the OTHER agent", self.role.value)
             else:
-                logger.info(f"{self.role.value}: Human didn't mention specific agent")
+                logger.info("%s: Human didn't mention specific agent", self.role.value)
         
         # Build language instruction
         language_instruction = LanguageInstructions.get_instructions(
@@ -199,31 +607,31 @@ class LLMAgentBase(BaseAgent):
                     self.task_context.task_type.value
                 )
                 logger.info(
-                    f"{self.role.value}: Retrieved relevant context - "
-                    f"{len(relevant_context.related_files)} files, "
-                    f"{len(relevant_context.similar_patterns)} patterns"
+                    "%s: Retrieved relevant context - %s files, %s patterns",
+                    self.role.value, len(relevant_context.related_files), len(relevant_context.similar_patterns)
                 )
 
                 # Analyze overall codebase structure (cached)
                 codebase_structure = self.codebase_intelligence.analyze_codebase()
             except Exception as e:
-                logger.warning(f"{self.role.value}: Codebase intelligence query failed: {e}")
+                logger.warning("%s: Codebase intelligence query failed: %s", self.role.value, e)
         elif skip_rag and self.codebase_intelligence:
-            logger.info(f"{self.role.value}: Skipping Codebase Intelligence query (already provided by Planning Mode)")
+            logger.info("%s: Skipping Codebase Intelligence query (already provided by Planning Mode)", self.role.value)
 
         # Query RAG for codebase context if available (fallback/additional context)
         rag_context = ""
         if self.rag_chain and not skip_rag:
             try:
-                rag_result = self.query_rag(previous_message.content)
-                if rag_result:
-                    # Use PromptGenerator to build context addon
-                    if self.use_dynamic_prompts and self.task_context and relevant_context:
-                        rag_context = PromptGenerator.build_context_prompt_addon(
-                            self.task_context,
-                            relevant_context
-                        )
-                    else:
+                if self.use_dynamic_prompts and self.task_context and relevant_context:
+                    # Use PromptGenerator to build context addon (carries the
+                    # per-message relevant context kept out of the system prompt)
+                    rag_context = PromptGenerator.build_context_prompt_addon(
+                        self.task_context,
+                        relevant_context
+                    )
+                else:
+                    rag_result = self.query_rag(previous_message.content)
+                    if rag_result:
                         # Fallback to old format
                         rag_context = f"""
 📚 CODEBASE CONTEXT (from RAG search):
@@ -231,11 +639,11 @@ class LLMAgentBase(BaseAgent):
 
 Use this codebase context to inform your planning suggestions. Reference specific files/functions when relevant.
 """
-                    logger.info(f"{self.role.value}: Retrieved RAG context ({len(rag_result)} chars)")
+                        logger.info("%s: Retrieved RAG context (%s chars)", self.role.value, len(rag_result))
             except Exception as e:
-                logger.warning(f"{self.role.value}: RAG query failed: {e}")
+                logger.warning("%s: RAG query failed: %s", self.role.value, e)
         elif skip_rag:
-            logger.info(f"{self.role.value}: Skipping RAG query (already provided by Planning Mode)")
+            logger.info("%s: Skipping RAG query (already provided by Planning Mode)", self.role.value)
 
         # Build the user prompt
         user_prompt = f"""Previous conversation:
@@ -249,49 +657,76 @@ Exchange count: {exchange_count} (Total messages: {len(all_messages)})
 
 Respond naturally in your characteristic style as {self.role.value}.{language_instruction}{convergence_guidance}"""
         
-        try:
-            # === NEW: Generate dynamic system prompt if enabled ===
-            system_prompt_to_use = self.system_prompt  # Default
+        # === NEW: Generate dynamic system prompt if enabled ===
+        system_prompt_to_use = self.system_prompt  # Default
 
-            if self.use_dynamic_prompts and self.task_context:
-                try:
-                    # Generate dynamic prompt based on task context and codebase
+        if self.use_dynamic_prompts and self.task_context:
+            try:
+                cached_prompt = self._dynamic_prompt_cache
+                if (
+                    cached_prompt is not None
+                    and cached_prompt[0] is self.task_context
+                    and cached_prompt[1] is codebase_structure
+                ):
+                    # Same task and codebase analysis as last turn - reuse the prompt
+                    dynamic_prompt = cached_prompt[2]
+                else:
+                    # Generate dynamic prompt based on task context and codebase.
+                    # Per-message relevant context goes into the user prompt (rag_context)
+                    # so the system prompt stays stable across turns.
                     dynamic_prompt = PromptGenerator.generate_planning_prompt(
                         role=self.role,
                         task_context=self.task_context,
-                        codebase_structure=codebase_structure,
-                        relevant_context=relevant_context
+                        codebase_structure=codebase_structure
                     )
-                    system_prompt_to_use = dynamic_prompt
-                    logger.info(
-                        f"{self.role.value}: Using dynamic prompt for "
-                        f"{self.task_context.task_type.value} task "
-                        f"(complexity: {self.task_context.complexity.value})"
-                    )
-                except Exception as e:
-                    logger.warning(f"{self.role.value}: Dynamic prompt generation failed, using default: {e}")
+                    self._dynamic_prompt_cache = (self.task_context, codebase_structure, dynamic_prompt)
+                system_prompt_to_use = dynamic_prompt
+                logger.info(
+                    "%s: Using dynamic prompt for %s task (complexity: %s)",
+                    self.role.value, self.task_context.task_type.value, self.task_context.complexity.value
+                )
+            except Exception as e:
+                logger.warning("%s: Dynamic prompt generation failed, using default: %s", self.role.value, e)
 
-            # Call the LLM (implemented by subclass)
-            generated_text = self._call_llm(system_prompt_to_use, user_prompt)
+        return (
+            system_prompt_to_use,
+            user_prompt,
+            exchange_count,
+            self._max_tokens_for(human_wants_stop, exchange_count)
+        )
 
-            logger.info(
-                f"{self.role.value} generated {len(generated_text)} chars "
-                f"(exchange {exchange_count}) in {self.detected_language or 'english'}"
-            )
+    def _max_tokens_for(self, human_wants_stop: bool, exchange_count: int) -> Optional[int]:
+        """
+        Output token cap for the next response.
 
-            return generated_text
-            
-        except Exception as e:
-            logger.error(f"Error calling LLM API: {e}", exc_info=True)
-            
-            # Get agent type name for better error message
-            agent_type = self.__class__.__name__.replace("Agent", "")
-            
-            # Fallback response if API fails
-            if self.detected_language == 'vietnamese':
-                return f"⚠️ Xin lỗi, tôi gặp sự cố với {agent_type} API. Lỗi: {str(e)[:100]}... \n\nVui lòng thử lại hoặc chuyển sang agent khác."
-            else:
-                return f"⚠️ I apologize, I'm having trouble with {agent_type} API. Error: {str(e)[:100]}... \n\nPlease try again or switch to another agent."
+        Summaries (human asked to stop, or 6+ exchanges) need room for the full
+        final code/schema; regular exchanges are asked for 150-300 words.
+        Configurable via `max_tokens` and `max_tokens_summary` (None = no cap).
+        """
+        if human_wants_stop or exchange_count >= 6:
+            return self.config.get('max_tokens_summary', 4096)
+        return self.config.get('max_tokens', 2048)
+
+    def _log_generated(self, generated_text: str, exchange_count: int) -> None:
+        """Log the size of a generated response."""
+        logger.info(
+            "%s generated %s chars (exchange %s) in %s",
+            self.role.value, len(generated_text), exchange_count, self.detected_language or 'english'
+        )
+
+    def _llm_error_response(self, error: Exception) -> str:
+        """Build the fallback response returned when the LLM API call fails."""
+        logger.error("Error calling LLM API: %s", error, exc_info=True)
+        
+        # Get agent type name for better error message
+        agent_type = type(self).__name__.replace("Agent", "")
+        
+        # Bounded summary of the error (some SDK errors carry whole response bodies)
+        error_summary = f"{type(error).__name__}: {str(error)[:_ERROR_SUMMARY_LENGTH]}"
+        
+        # Fallback response if API fails
+        template = _ERROR_RESPONSE_VI if self.detected_language == 'vietnamese' else _ERROR_RESPONSE_EN
+        return template.format(agent_type=agent_type, error=error_summary)
     
     def decide_signal(self, response_content: str, conversation_history: List[Message]) -> Signal:
         """
@@ -307,85 +742,52 @@ Respond naturally in your characteristic style as {self.role.value}.{language_in
         Returns:
             Signal (CONTINUE or HANDOVER only)
         """
-        # Count agent exchanges
-        exchange_count = ConversationAnalyzer.count_agent_exchanges(conversation_history)
-        
-        # Count exchanges since last human input
-        exchanges_since_human = ConversationAnalyzer.count_exchanges_since_human(conversation_history)
-        
-        # Vietnamese agreement/conclusion keywords
-        vietnamese_conclusion = [
-            "tóm lại", "kết luận", "thống nhất rồi", "quyết định là", 
-            "vậy là xong", "oke như vậy", "ok đó là xong", "ổn rồi nhé", 
-            "đã rõ ràng", "rõ ràng rồi nhé", "như vậy là tốt", "xong rồi",
-            "📌 tóm tắt", "📌 summary"
-        ]
-        
-        vietnamese_agreement = [
-            "hoàn toàn đồng ý", "chính xác luôn", "chuẩn không cần chỉnh",
-            "tốt lắm", "hay lắm", "ý hay đấy", "được luôn"
-        ]
-        
-        # English agreement/conclusion keywords
-        english_conclusion = [
-            "in conclusion", "to summarize", "in summary", "final thought", 
-            "to conclude", "alright, that's it", "sounds perfect", "let's ship it", 
-            "that's our decision", "we're done", "that's settled", "agreed on that",
-            "cool, we're aligned", "perfect, let's go"
-        ]
-        
-        english_agreement = [
-            "completely agree", "absolutely right", "spot on", "couldn't agree more",
-            "that's perfect", "love that approach"
-        ]
-        
-        content_lower = response_content.lower()
-        
-        # Check for conclusion/agreement signals
-        has_strong_conclusion = any(
-            keyword in content_lower 
-            for keyword in (vietnamese_conclusion + english_conclusion)
-        )
-        has_strong_agreement = any(
-            keyword in content_lower 
-            for keyword in (vietnamese_agreement + english_agreement)
-        )
+        # Count agent exchanges, overall and since last human input
+        exchange_count, exchanges_since_human = ConversationAnalyzer.count_exchanges(conversation_history)
         
         # ✋ HANDOVER to human after every 2-3 exchanges (more human involvement)
         if exchanges_since_human >= 2:
             logger.info(
-                f"{self.role.value}: 2+ exchanges since human input ({exchanges_since_human}), "
-                f"sending HANDOVER for human involvement"
+                "%s: 2+ exchanges since human input (%s), sending HANDOVER for human involvement",
+                self.role.value, exchanges_since_human
             )
             return Signal.HANDOVER
         
         # If 6+ total exchanges, handover to let human decide next steps
         if exchange_count >= 6:
             logger.info(
-                f"{self.role.value}: 6+ exchanges ({exchange_count}), "
-                f"sending HANDOVER to let human decide"
+                "%s: 6+ exchanges (%s), sending HANDOVER to let human decide",
+                self.role.value, exchange_count
             )
             return Signal.HANDOVER
         
+        # Conclusion/agreement only count after 2+ exchanges; before that only
+        # an explicit request for human input hands over
+        if exchange_count >= 2:
+            match = _HANDOVER_PHRASE_RE.search(response_content)
+            phrase_kind = match.lastgroup if match else None
+        else:
+            phrase_kind = "human_input" if _HUMAN_INPUT_RE.search(response_content) else None
+        
         # If showing strong conclusion, handover to let human confirm or continue
-        if has_strong_conclusion and exchange_count >= 2:
+        if phrase_kind == "conclusion":
             logger.info(
-                f"{self.role.value}: Strong conclusion detected after {exchange_count} exchanges, "
-                f"sending HANDOVER for human confirmation"
+                "%s: Strong conclusion detected after %s exchanges, sending HANDOVER for human confirmation",
+                self.role.value, exchange_count
             )
             return Signal.HANDOVER
         
         # If strong agreement, handover to let human approve or add thoughts
-        if has_strong_agreement and exchange_count >= 2:
+        if phrase_kind == "agreement":
             logger.info(
-                f"{self.role.value}: Strong agreement detected, "
-                f"sending HANDOVER for human input"
+                "%s: Strong agreement detected, sending HANDOVER for human input",
+                self.role.value
             )
             return Signal.HANDOVER
         
         # If explicitly asking for human input
-        if "human" in content_lower or "moderator" in content_lower:
-            logger.info(f"{self.role.value}: Requesting human input")
+        if phrase_kind == "human_input":
+            logger.info("%s: Requesting human input", self.role.value)
             return Signal.HANDOVER
         
         # Default: continue the conversation
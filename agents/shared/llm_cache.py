@@ -0,0 +1,92 @@
+"""
+LLM response cache for AI agents.
+Skips the remote API call when the exact same prompts were answered recently.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class LLMResponseCache:
+    """LRU cache of LLM responses keyed on a hash of (system_prompt, user_prompt, max_tokens), with TTL expiry."""
+
+    def __init__(self, maxsize: int = 512, ttl_seconds: Optional[float] = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of cached responses (0 disables caching)
+            ttl_seconds: Seconds before an entry expires (None = never expires)
+        """
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Lookup counters: hits skipped the API call, misses went to the LLM
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> bytes:
+        """Build a compact cache key from both prompts and the output token cap."""
+        return hashlib.blake2b(
+            f"{max_tokens}\x00{system_prompt}\x00{user_prompt}".encode("utf-8"),
+            digest_size=16
+        ).digest()
+
+    def get(self, system_prompt: str, user_prompt: str, max_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            system_prompt: The system prompt
+            user_prompt: The user prompt
+            max_tokens: Output token cap the response was generated with
+
+        Returns:
+            The cached response, or None on a miss or expired entry
+        """
+        if self.maxsize <= 0:
+            self.misses += 1
+            return None
+
+        key = self.make_key(system_prompt, user_prompt, max_tokens)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, response = entry
+            if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, system_prompt: str, user_prompt: str, response: str, max_tokens: Optional[int] = None) -> None:
+        """Store a response, evicting the least recently used entry when full."""
+        if self.maxsize <= 0 or not response:
+            return
+
+        key = self.make_key(system_prompt, user_prompt, max_tokens)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,150 @@
+"""
+Shared LLM SDK clients for AI agents.
+
+Agents configured with the same credentials reuse one client instead of each
+opening their own, and all OpenAI(-compatible) clients share one HTTP
+connection pool. Provider SDKs are imported on first use so only the
+providers actually configured are loaded.
+"""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+
+_lock = threading.Lock()
+
+# (api_key, base_url) -> OpenAI client
+_OPENAI_CLIENTS: Dict[Tuple[Optional[str], Optional[str]], Any] = {}
+
+# event loop -> {(api_key, base_url) -> AsyncOpenAI client}
+# Async clients hold connections bound to the loop they were used on, so they
+# are shared per loop and dropped together with it.
+_ASYNC_OPENAI_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Optional[str], Optional[str]], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# HTTP client (connection pool) shared by all sync OpenAI clients
+_openai_http_client = None
+
+# event loop -> HTTP client shared by the async OpenAI clients on that loop
+_ASYNC_OPENAI_HTTP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+    weakref.WeakKeyDictionary()
+)
+
+# (api_key, model_name) -> Gemini GenerativeModel
+_GEMINI_MODELS: Dict[Tuple[Optional[str], str], Any] = {}
+
+
+def _http_client_options() -> dict:
+    """
+    Options for the shared HTTP clients.
+
+    HTTP/2 (several requests multiplexed on one connection) is used when the
+    optional h2 package is installed; otherwise httpx stays on HTTP/1.1.
+    """
+    return {"http2": True} if importlib.util.find_spec("h2") else {}
+
+
+def get_openai_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """
+    Get the shared OpenAI(-compatible) client for these credentials.
+
+    Args:
+        api_key: API key
+        base_url: Optional endpoint (None = OpenAI's official endpoint)
+
+    Returns:
+        An openai.OpenAI client
+    """
+    key = (api_key, base_url)
+    with _lock:
+        client = _OPENAI_CLIENTS.get(key)
+        if client is None:
+            from openai import DefaultHttpxClient, OpenAI
+
+            global _openai_http_client
+            if _openai_http_client is None:
+                _openai_http_client = DefaultHttpxClient(**_http_client_options())
+
+            # Retries are handled by LLMAgentBase, so the SDK must not add its own
+            client_kwargs = {"api_key": api_key, "http_client": _openai_http_client, "max_retries": 0}
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            client = _OPENAI_CLIENTS[key] = OpenAI(**client_kwargs)
+        return client
+
+
+def get_async_openai_client(api_key: Optional[str], base_url: Optional[str] = None):
+    """
+    Get the shared AsyncOpenAI client for these credentials on the running event loop.
+
+    Must be called from inside a coroutine.
+
+    Args:
+        api_key: API key
+        base_url: Optional endpoint (None = OpenAI's official endpoint)
+
+    Returns:
+        An openai.AsyncOpenAI client
+    """
+    loop = asyncio.get_running_loop()
+    key = (api_key, base_url)
+    with _lock:
+        loop_clients = _ASYNC_OPENAI_CLIENTS.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None:
+            from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+            http_client = _ASYNC_OPENAI_HTTP_CLIENTS.get(loop)
+            if http_client is None:
+                http_client = _ASYNC_OPENAI_HTTP_CLIENTS[loop] = DefaultAsyncHttpxClient(**_http_client_options())
+
+            client_kwargs = {"api_key": api_key, "http_client": http_client, "max_retries": 0}
+            if base_url:
+                client_kwargs["base_url"] = base_url
+            client = loop_clients[key] = AsyncOpenAI(**client_kwargs)
+        return client
+
+
+async def close_async_openai_clients() -> None:
+    """
+    Close the async OpenAI clients of the running event loop.
+
+    Await this before a short-lived loop (such as one started by asyncio.run)
+    finishes, so its connection pool is released instead of leaking.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        _ASYNC_OPENAI_CLIENTS.pop(loop, None)
+        http_client = _ASYNC_OPENAI_HTTP_CLIENTS.pop(loop, None)
+    if http_client is not None:
+        await http_client.aclose()
+
+
+def get_gemini_model(api_key: Optional[str], model_name: str, generation_config: dict):
+    """
+    Get the shared Gemini GenerativeModel for these credentials and model.
+
+    Args:
+        api_key: Gemini API key
+        model_name: Gemini model name
+        generation_config: Generation config used when the model is first created
+
+    Returns:
+        A google.generativeai.GenerativeModel
+    """
+    key = (api_key, model_name)
+    with _lock:
+        model = _GEMINI_MODELS.get(key)
+        if model is None:
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            model = _GEMINI_MODELS[key] = genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config
+            )
+        return model
@@ -308,7 +308,7 @@ No codebase context available. Provide general best practices.
 
         # Relevant files
         if relevant_context and relevant_context.related_files:
-            file_list = [f"`{f['path']}`" for f in relevant_context.related_files[:5]]
+            file_list = [f"`{f.path}`" for f in relevant_context.related_files[:5]]
             sections.append(f"**Relevant Files:** {', '.join(file_list)}")
 
         # Similar patterns
@@ -414,10 +414,10 @@ No codebase context available. Provide general best practices.
         if relevant_context.related_files:
             addon_parts.append("\nRelevant Files Found:")
             for i, file_info in enumerate(relevant_context.related_files[:3], 1):
-                addon_parts.append(f"{i}. `{file_info['path']}`")
-                if file_info.get('context'):
+                addon_parts.append(f"{i}. `{file_info.path}`")
+                if file_info.context:
                     # Show a snippet of context
-                    context_snippet = file_info['context'][:150].strip()
+                    context_snippet = file_info.context[:150].strip()
                     addon_parts.append(f"   Context: {context_snippet}...")
 
         # Add similar patterns
@@ -430,6 +430,10 @@ No codebase context available. Provide general best practices.
         if relevant_context.suggested_approach:
             addon_parts.append(f"\nSuggested Approach: {relevant_context.suggested_approach}")
 
+        # Add dependencies to consider
+        if relevant_context.dependencies_to_consider:
+            addon_parts.append(f"\nAvailable Libraries: {', '.join(relevant_context.dependencies_to_consider[:5])}")
+
         addon_parts.append("--- END CODEBASE INTELLIGENCE ---\n")
 
         return "\n".join(addon_parts)
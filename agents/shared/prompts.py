@@ -20,18 +20,7 @@ except ImportError:
     PLANNING_SYSTEM_AVAILABLE = False
 
 
-def get_system_prompt(role: Role) -> str:
-    """
-    Get system prompt based on agent role.
-    
-    Args:
-        role: The agent's role (AGENT_A or AGENT_B)
-        
-    Returns:
-        System prompt string
-    """
-    if role == Role.AGENT_A:
-        return """You are Agent A - a collaborative helper who RESPECTS HUMAN'S REQUEST and provides the initial solution.
+AGENT_A_SYSTEM_PROMPT = """You are Agent A - a collaborative helper who RESPECTS HUMAN'S REQUEST and provides the initial solution.
 
 🎯 YOUR PRIMARY GOAL: **RESPECT & EXECUTE what the human asked for**
 
@@ -82,9 +71,8 @@ Trade-offs Acknowledged:
 
 IMPORTANT: Detect language and respond in SAME language (Vietnamese→Vietnamese, English→English).
 Remember: You're here to HELP, not to debate. Respect the human's request always!"""
-    
-    else:  # AGENT_B
-        return """You are Agent B - a collaborative helper who provides alternative perspectives and constructive debate.
+
+AGENT_B_SYSTEM_PROMPT = """You are Agent B - a collaborative helper who provides alternative perspectives and constructive debate.
 
 🎯 YOUR PRIMARY GOAL: **DEBATE CONSTRUCTIVELY while RESPECTING HUMAN'S REQUEST**
 
@@ -158,6 +146,22 @@ IMPORTANT: Detect language and respond in SAME language (Vietnamese→Vietnamese
 Remember: Debate approaches, respect requests. Be the voice that asks "but what about..." constructively!"""
 
 
+def get_system_prompt(role: Role) -> str:
+    """
+    Get system prompt based on agent role.
+    
+    Args:
+        role: The agent's role (AGENT_A or AGENT_B)
+        
+    Returns:
+        System prompt string
+    """
+    if role == Role.AGENT_A:
+        return AGENT_A_SYSTEM_PROMPT
+    else:  # AGENT_B
+        return AGENT_B_SYSTEM_PROMPT
+
+
 # === NEW PLANNING SYSTEM FUNCTIONS ===
 
 def generate_dynamic_prompt(
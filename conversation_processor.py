@@ -175,7 +175,8 @@ class ConversationProcessor:
                 logger.error(f"Session {session_id} not found")
                 return False
 
-            messages = self.db.get_messages(session_id)
+            # Only the initial message is needed here
+            messages = self.db.get_messages(session_id, limit=1)
             if not messages:
                 logger.error(f"No messages found for session {session_id}")
                 return False
@@ -207,15 +208,12 @@ class ConversationProcessor:
                 logger.error(f"Session {session_id} not found")
                 return False
 
-            # Get all messages
-            messages = self.db.get_messages(session_id)
-            if not messages:
+            # Get the last message (could be from human or agent)
+            last_message = self.db.get_last_message(session_id)
+            if not last_message:
                 logger.error(f"No messages found for session {session_id}")
                 return False
 
-            # Get the last message (could be from human or agent)
-            last_message = messages[-1]
-
             # Route based on mode
             if session.mode == ConversationMode.PLANNING:
                 # Check if last message is from human (interrupt)
@@ -225,7 +223,7 @@ class ConversationProcessor:
                 # DEBATE mode - original logic
                 is_stop_request = (
                     last_message.role == Role.HUMAN and
-                    ('🛑 STOP' in last_message.content or 'stop' in last_message.content.lower())
+                    'stop' in last_message.content_lower
                 )
 
                 if is_stop_request:
@@ -265,10 +263,13 @@ class ConversationProcessor:
             # Detect language from the trigger message
             language = LanguageDetector.detect(trigger_message.content)
 
+            # State carried from one turn to the next (loaded from the database on the first turn)
+            state = None
+
             if is_start:
                 # Initialize planning state
                 logger.info(f"📊 LangGraph: Starting planning workflow for session {session_id}")
-                self.planning_workflow.initialize_state(
+                state = self.planning_workflow.initialize_state(
                     session_id=session_id,
                     request=trigger_message.content,
                     language=language
@@ -285,7 +286,8 @@ class ConversationProcessor:
                 logger.info(f"📊 LangGraph: Executing turn {iteration} (human_interrupt={human_message is not None})")
                 state, response = self.planning_workflow.execute_one_turn(
                     session_id=session_id,
-                    human_message=human_message
+                    human_message=human_message,
+                    state=state
                 )
 
                 # Clear human_message after first iteration (only applies to first node)
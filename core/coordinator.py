@@ -5,10 +5,9 @@ Coordination system for managing turn-taking and signal handling between agents.
 import time
 import logging
 from typing import Optional, Callable
-from datetime import datetime
 
 from core.database import Database
-from core.message import Message, Session, Role, Signal
+from core.message import Message, Session, Role, Signal, utc_now
 
 
 logger = logging.getLogger(__name__)
@@ -77,18 +76,17 @@ class Coordinator:
         timeout = timeout or self.timeout_seconds
         start_time = time.time()
         
+        # Only the newest message matters, so poll for that alone
         last_checked_id = 0
-        messages = self.db.get_messages(session_id)
-        if messages:
-            last_checked_id = messages[-1].id or 0
+        last_msg = self.db.get_last_message(session_id)
+        if last_msg:
+            last_checked_id = last_msg.id or 0
         
         while time.time() - start_time < timeout:
-            messages = self.db.get_messages(session_id)
+            last_msg = self.db.get_last_message(session_id)
             
             # Check if there's a new message
-            if messages and (messages[-1].id or 0) > last_checked_id:
-                last_msg = messages[-1]
-                
+            if last_msg and (last_msg.id or 0) > last_checked_id:
                 # Check if it's from the expected role
                 if last_msg.role == expected_role:
                     logger.info(f"Received signal '{last_msg.signal.value}' from {expected_role.value}")
@@ -187,7 +185,7 @@ class Coordinator:
                 time.sleep(1.0)  # Increased from 0.2s to 1s
         
         # Mark session as completed
-        self.db.update_session_status(session.id, "completed", datetime.utcnow())
+        self.db.update_session_status(session.id, "completed", utc_now())
         logger.info(f"Session {session.id} completed")
     
     def pause_session(self, session_id: str):
@@ -220,7 +218,7 @@ class Coordinator:
             role=Role.HUMAN,
             content=content,
             signal=signal,
-            timestamp=datetime.utcnow()
+            timestamp=utc_now()
         )
         
         message = self.db.add_message(message)
@@ -11,6 +11,14 @@ from contextlib import contextmanager
 from core.message import Message, Session, Role, Signal, ConversationMode
 
 
+# planning_state columns that update_planning_state may set (by how they are stored)
+_PLANNING_TEXT_FIELDS = frozenset((
+    "current_node", "request", "language",
+    "agent_a_analysis", "agent_a_proposal", "agent_b_review", "final_plan",
+))
+_PLANNING_JSON_FIELDS = frozenset(("codebase_context", "identified_files", "validation_issues"))
+
+
 class Database:
     """SQLite database manager for agent communication."""
     
@@ -184,23 +192,32 @@ class Database:
             
             cursor.execute(query, (session_id,))
             
-            messages = []
-            for row in cursor.fetchall():
-                messages.append(Message(
-                    id=row["id"],
-                    session_id=row["session_id"],
-                    role=Role(row["role"]),
-                    content=row["content"],
-                    signal=Signal(row["signal"]),
-                    timestamp=datetime.fromisoformat(row["timestamp"])
-                ))
-            
-            return messages
+            return [self._row_to_message(row) for row in cursor.fetchall()]
     
     def get_last_message(self, session_id: str) -> Optional[Message]:
-        """Get the most recent message in a session."""
-        messages = self.get_messages(session_id, limit=1)
-        return messages[-1] if messages else None
+        """Get the most recent message in a session (without loading the others)."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT * FROM messages 
+                WHERE session_id = ? 
+                ORDER BY timestamp DESC, id DESC
+                LIMIT 1
+            """, (session_id,))
+            row = cursor.fetchone()
+            return self._row_to_message(row) if row else None
+    
+    @staticmethod
+    def _row_to_message(row) -> Message:
+        """Build a Message from a messages table row."""
+        return Message(
+            id=row["id"],
+            session_id=row["session_id"],
+            role=Role(row["role"]),
+            content=row["content"],
+            signal=Signal(row["signal"]),
+            timestamp=datetime.fromisoformat(row["timestamp"])
+        )
     
     def get_message_count(self, session_id: str) -> int:
         """Get total message count for a session."""
@@ -298,6 +315,41 @@ class Database:
                 datetime.now().isoformat()
             ))
 
+    def update_planning_state(self, session_id: str, changes: dict) -> bool:
+        """
+        Update only the given fields of an existing planning state.
+
+        Args:
+            session_id: Session whose state to update
+            changes: Changed state fields (keys that are not stored columns are ignored)
+
+        Returns:
+            True if a stored state was updated, False if none exists for the session
+        """
+        import json
+        columns = []
+        values = []
+        for field, value in changes.items():
+            if field in _PLANNING_JSON_FIELDS:
+                value = json.dumps(value)
+            elif field == "validation_passed":
+                value = 1 if value else 0
+            elif field not in _PLANNING_TEXT_FIELDS:
+                continue
+            columns.append(f"{field} = ?")
+            values.append(value)
+
+        columns.append("updated_at = ?")
+        values.append(datetime.now().isoformat())
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE planning_state SET {', '.join(columns)} WHERE session_id = ?",
+                (*values, session_id)
+            )
+            return cursor.rowcount > 0
+
     def delete_planning_state(self, session_id: str):
         """Delete planning state for a session."""
         with self.get_connection() as conn:
@@ -2,12 +2,17 @@
 Core message model and utilities for the dual AI collaboration framework.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 from pydantic import BaseModel, Field
 
 
+def utc_now() -> datetime:
+    """Current UTC time as a naive datetime (the format stored in the database)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Role(str, Enum):
     """Message sender role."""
     AGENT_A = "AgentA"
@@ -36,7 +41,12 @@ class Message(BaseModel):
     role: Role
     content: str
     signal: Signal
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=utc_now)
+    
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content for keyword matching (callers lowercase once and pass it down)."""
+        return self.content.lower()
     
     def to_dict(self) -> dict:
         """Convert message to dictionary."""
@@ -79,7 +89,7 @@ class Session(BaseModel):
 
     id: str
     topic: Optional[str] = None
-    started_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: datetime = Field(default_factory=utc_now)
     ended_at: Optional[datetime] = None
     status: str = "active"  # active, paused, completed
     mode: ConversationMode = ConversationMode.PLANNING  # planning or debate
@@ -0,0 +1,328 @@
+"""
+Unit tests for planning system components (caches, persistence, workflow turns).
+Uses stub retrievers and agents - no LLM or vector store required.
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def print_section(title: str):
+    """Print formatted section header"""
+    print(f"\n{'='*70}")
+    print(f"  {title}")
+    print(f"{'='*70}\n")
+
+
+class StubDocument:
+    """Minimal stand-in for a LangChain Document"""
+
+    def __init__(self, page_content: str, source: str = "stub.py"):
+        self.page_content = page_content
+        self.metadata = {"source": source}
+
+
+class StubRetriever:
+    """Retriever that returns fixed documents and counts batch() calls"""
+
+    def __init__(self):
+        self.batch_calls = 0
+
+    def batch(self, queries):
+        self.batch_calls += 1
+        return [
+            [StubDocument("See agents/planning_nodes.py for the nodes", "agents/planning_nodes.py")]
+            for _ in queries
+        ]
+
+
+def test_retrieval_cache():
+    """A repeated planning request is served from the retrieval cache"""
+    print_section("TEST 1: Planning Retrieval Cache")
+
+    from agents.planning_nodes import PlanningNodes
+
+    retriever = StubRetriever()
+    nodes = PlanningNodes(retriever, None, None)
+
+    first = nodes._retrieve_codebase_context("Add a feature")
+    second = nodes._retrieve_codebase_context("  add a   FEATURE ")
+
+    assert retriever.batch_calls == 1, f"expected 1 retrieval, got {retriever.batch_calls}"
+    assert first == second
+    assert second[1] == {"agents/planning_nodes.py"}
+    assert all(isinstance(key, bytes) for key in nodes._retrieval_cache)
+
+    print(f"✓ Retriever batches: {retriever.batch_calls}")
+    print(f"✓ Cached requests: {len(nodes._retrieval_cache)}")
+
+    print("\n✅ Retrieval cache working correctly!\n")
+
+
+class StubAgent:
+    """Agent whose async responses are recorded; the sync path must not be used"""
+
+    def __init__(self):
+        self.sessions = []
+
+    def generate_response(self, message, skip_rag=False):
+        raise AssertionError("async turn called the sync agent")
+
+    async def generate_response_async(self, message, skip_rag=False):
+        self.sessions.append(message.session_id)
+        return "Update agents/planning_nodes.py"
+
+
+def test_async_planning_turn():
+    """execute_one_turn_async runs an LLM node and persists the state change"""
+    print_section("TEST 2: Async Planning Turn")
+
+    import asyncio
+    import tempfile
+    from core.database import Database
+    from core.message import Session
+    from agents.planning_graph import TurnBasedPlanningWorkflow, _current_session_id
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "planning.db"))
+        db.initialize()
+        db.create_session(Session(id="async-session", topic="Add a feature"))
+
+        agent_a, agent_b = StubAgent(), StubAgent()
+        workflow = TurnBasedPlanningWorkflow(db, None, agent_a, agent_b)
+        state = workflow.initialize_state("async-session", "Add a feature", "english")
+
+        async def run_turn():
+            result = await workflow.execute_one_turn_async("async-session", state=state)
+            # The turn's session id must not leak into the awaiting context
+            assert _current_session_id.get() == "planning-session"
+            return result
+
+        state, message = asyncio.run(run_turn())
+
+        assert agent_a.sessions == ["async-session"]
+        assert agent_b.sessions == []
+        assert state["agent_a_analysis"] == "Update agents/planning_nodes.py"
+        assert state["current_node"] == "propose_changes"
+        assert message is not None
+
+        saved = db.get_planning_state("async-session")
+        assert saved["current_node"] == "propose_changes"
+        assert saved["agent_a_analysis"] == "Update agents/planning_nodes.py"
+
+    print(f"✓ Agent A calls: {len(agent_a.sessions)}")
+    print(f"✓ Next node: {state['current_node']}")
+
+    print("\n✅ Async planning turn working correctly!\n")
+
+
+def test_response_cache_eviction():
+    """LLMResponseCache evicts the least recently used entry and expires old ones"""
+    print_section("TEST 3: LLM Response Cache Eviction")
+
+    import time
+    from agents.shared.llm_cache import LLMResponseCache
+
+    cache = LLMResponseCache(maxsize=2, ttl_seconds=None)
+    cache.put("system", "first", "response 1", 2048)
+    cache.put("system", "second", "response 2", 2048)
+    assert cache.get("system", "first", 2048) == "response 1"  # first is now most recent
+    cache.put("system", "third", "response 3", 2048)
+
+    assert len(cache) == 2
+    assert cache.get("system", "second", 2048) is None
+    assert cache.get("system", "first", 2048) == "response 1"
+    assert cache.get("system", "third", 4096) is None  # different token cap
+    print(f"✓ LRU eviction (hits={cache.hits}, misses={cache.misses})")
+
+    cache = LLMResponseCache(maxsize=2, ttl_seconds=0.01)
+    cache.put("system", "user", "response", 2048)
+    time.sleep(0.02)
+    assert cache.get("system", "user", 2048) is None
+    assert len(cache) == 0
+    print("✓ TTL expiry")
+
+    print("\n✅ Response cache eviction working correctly!\n")
+
+
+def test_update_planning_state():
+    """update_planning_state writes only the given columns"""
+    print_section("TEST 4: Partial Planning State Update")
+
+    import tempfile
+    from core.database import Database
+    from core.message import Session
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "planning.db"))
+        db.initialize()
+        db.create_session(Session(id="state-session", topic="Add a feature"))
+
+        assert not db.update_planning_state("state-session", {"current_node": "propose_changes"})
+
+        db.save_planning_state("state-session", {
+            "request": "Add a feature",
+            "identified_files": ["agents/planning_nodes.py"],
+            "agent_a_analysis": "Original analysis",
+        })
+        assert db.update_planning_state("state-session", {
+            "current_node": "validate_proposal",
+            "validation_passed": True,
+            "validation_issues": ["Too abstract"],
+            "messages": ["not a column"],
+        })
+
+        state = db.get_planning_state("state-session")
+        assert state["current_node"] == "validate_proposal"
+        assert state["validation_passed"] is True
+        assert state["validation_issues"] == ["Too abstract"]
+        assert state["request"] == "Add a feature"
+        assert state["identified_files"] == ["agents/planning_nodes.py"]
+        assert state["agent_a_analysis"] == "Original analysis"
+
+    print("✓ Given columns updated, others untouched")
+
+    print("\n✅ Partial planning state update working correctly!\n")
+
+
+def test_get_last_message():
+    """get_last_message returns the newest row of the session"""
+    print_section("TEST 5: Last Message Lookup")
+
+    import tempfile
+    from datetime import datetime, timedelta
+    from core.database import Database
+    from core.message import Message, Role, Session, Signal
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db = Database(os.path.join(tmp_dir, "messages.db"))
+        db.initialize()
+        db.create_session(Session(id="message-session", topic="Add a feature"))
+        db.create_session(Session(id="other-session", topic="Something else"))
+
+        assert db.get_last_message("message-session") is None
+
+        now = datetime.now()
+        db.add_message(Message(session_id="message-session", role=Role.HUMAN,
+                               content="first", signal=Signal.CONTINUE, timestamp=now))
+        db.add_message(Message(session_id="message-session", role=Role.AGENT_A,
+                               content="second", signal=Signal.CONTINUE, timestamp=now))
+        db.add_message(Message(session_id="message-session", role=Role.AGENT_B,
+                               content="older", signal=Signal.CONTINUE, timestamp=now - timedelta(minutes=1)))
+        db.add_message(Message(session_id="other-session", role=Role.HUMAN,
+                               content="other", signal=Signal.CONTINUE, timestamp=now + timedelta(minutes=1)))
+
+        last = db.get_last_message("message-session")
+        assert last.content == "second", last.content
+        assert last.role == Role.AGENT_A
+
+    print(f"✓ Last message: {last.content}")
+
+    print("\n✅ Last message lookup working correctly!\n")
+
+
+def test_transient_llm_errors():
+    """_is_transient_llm_error retries rate limits, timeouts and 5xx only"""
+    print_section("TEST 6: Transient LLM Error Classification")
+
+    from agents.shared.llm_agent_base import _is_transient_llm_error
+
+    class RateLimitError(Exception):
+        pass
+
+    class APIStatusError(Exception):
+        def __init__(self, status_code):
+            super().__init__(f"status {status_code}")
+            self.status_code = status_code
+
+    assert _is_transient_llm_error(TimeoutError())
+    assert _is_transient_llm_error(ConnectionError())
+    assert _is_transient_llm_error(RateLimitError())
+    assert _is_transient_llm_error(APIStatusError(503))
+    assert _is_transient_llm_error(APIStatusError(429))
+    assert not _is_transient_llm_error(APIStatusError(401))
+    assert not _is_transient_llm_error(APIStatusError(400))
+    assert not _is_transient_llm_error(ValueError("bad prompt"))
+
+    print("✓ Transient: timeouts, connection errors, rate limits, 429/5xx")
+    print("✓ Permanent: auth errors, bad requests, other exceptions")
+
+    print("\n✅ Transient error classification working correctly!\n")
+
+
+def test_keyword_routing():
+    """Rule-based agents route inflected keywords like the original substring checks"""
+    print_section("TEST 7: Agent Keyword Routing")
+
+    from agents import agent_a, agent_b
+    from agents.agent_a import AgentA
+    from agents.agent_b import AgentB
+    from core.message import Message, Role, Signal
+
+    a, b = AgentA(None), AgentB(None)
+
+    def human(content: str) -> Message:
+        return Message(session_id="routing", role=Role.HUMAN, content=content, signal=Signal.CONTINUE)
+
+    for content in ("Let's have a discussion", "I reviewed the parser", "We are considering options"):
+        assert a._respond_to_human(human(content), content.lower()) == agent_a._TOPIC_RESPONSE, content
+
+    for content in ("What changes do we need", "Focusing on tests now", "Shifting to the API"):
+        assert b._respond_to_human(human(content), content.lower()) != agent_b._HUMAN_INPUT_RESPONSE, content
+    assert b._respond_to_human(human("Hello"), "hello") == agent_b._HUMAN_INPUT_RESPONSE
+
+    def from_agent(role: Role, content: str) -> Message:
+        return Message(session_id="routing", role=role, content=content, signal=Signal.CONTINUE)
+
+    for content in ("I agreed with that", "She agrees", "You described it correctly"):
+        assert a._respond_to_agent_b(from_agent(Role.AGENT_B, content), "", content.lower()) == agent_a._AGREE_RESPONSE, content
+    for content in ("We disagreed", "There are alternatives"):
+        assert a._respond_to_agent_b(from_agent(Role.AGENT_B, content), "", content.lower()) == agent_a._DISAGREE_RESPONSE, content
+
+    for content, expected in (
+        ("Be careful with the migration", agent_b._CRITICAL_RESPONSE),
+        ("That is critically important", agent_b._CRITICAL_RESPONSE),
+        ("I have two questions", agent_b._QUESTION_RESPONSE),
+        ("I'm thinking about the API", agent_b._QUESTION_RESPONSE),
+        ("We are considering a rewrite", agent_b._QUESTION_RESPONSE),
+        ("There are risks here", agent_b._CONCERN_RESPONSE),
+        ("The attribute looks fine", agent_b._ANALYTICAL_RESPONSE),
+    ):
+        assert b._respond_to_agent_a(from_agent(Role.AGENT_A, content), "", content.lower()) == expected, content
+
+    print("✓ Agent A topic and intent keywords")
+    print("✓ Agent B redirect and intent keywords")
+
+    print("\n✅ Agent keyword routing working correctly!\n")
+
+
+def main():
+    """Run all component tests"""
+    print("\n" + "="*70)
+    print("  🚀 PLANNING COMPONENTS - UNIT TESTS")
+    print("="*70)
+
+    try:
+        test_retrieval_cache()
+        test_async_planning_turn()
+        test_response_cache_eviction()
+        test_update_planning_state()
+        test_get_last_message()
+        test_transient_llm_errors()
+        test_keyword_routing()
+
+        print_section("✅ ALL TESTS PASSED")
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())